@@ -1,44 +1,136 @@
 from __future__ import annotations
 
+import gzip
+import hashlib
 import os
 import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta # Added timedelta
+from functools import lru_cache
+from operator import attrgetter
 from typing import Dict, List, Any # Added List, Any
 
-from flask import Flask, jsonify, render_template_string, request, send_file
+import orjson
+try:
+    import brotli  # Optional; gzip alone is used when it is missing
+except ImportError:
+    brotli = None
+try:
+    import fcntl  # POSIX only; serializes startup migrations across worker processes
+except ImportError:
+    fcntl = None
+import click
+from flask import Flask, abort, jsonify, request, send_file
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy.orm import scoped_session, sessionmaker 
+from markupsafe import escape
+from sqlalchemy import and_, case, event, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.orm import selectinload
 
 import logging
-logging.basicConfig(level=logging.DEBUG) 
 
 DB_URI = os.getenv("KANBAN_DB", "sqlite:///kanban.db")
 PORT   = int(os.getenv("KANBAN_PORT", 5000))
+DEBUG  = os.getenv("KANBAN_DEBUG") == "1"  # Verbose logs + SQL logging; off by default
+THREADS = int(os.getenv("KANBAN_THREADS", 8))  # Request worker threads for the WSGI server
+WAL_CHECKPOINT_INTERVAL = float(os.getenv("KANBAN_WAL_INTERVAL", 30))  # Seconds; 0 leaves it to SQLite
+SKIP_MIGRATE = os.getenv("KANBAN_SKIP_MIGRATE") == "1"  # Schema/seed left to `flask migrate`
+
+LOG_LEVEL = logging.DEBUG if DEBUG else logging.WARNING
+logging.basicConfig(level=LOG_LEVEL)
+
+def json_bytes(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=DefaultJSONProvider.default, option=orjson.OPT_NON_STR_KEYS)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify()/request.json through orjson; dates serialize natively as ISO strings"""
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return json_bytes(obj).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        return self._app.response_class(json_bytes(self._prepare_response_obj(args, kwargs)), mimetype=self.mimetype)
 
 app = Flask(__name__)
-app.logger.setLevel(logging.DEBUG)
+app.json = OrjsonProvider(app)
+app.logger.setLevel(LOG_LEVEL)
 
 app.config.update(
     SQLALCHEMY_DATABASE_URI=DB_URI, 
     SQLALCHEMY_TRACK_MODIFICATIONS=False,
-    SQLALCHEMY_ECHO=False  # Set to True for verbose SQL, False for cleaner logs
 )
+if DEBUG:
+    # SQL goes through the root handler; SQLALCHEMY_ECHO would add a second one
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+    # Log lazy loads that should be eager-loaded when nplusone is installed. It only
+    # logs: raising would turn every leftover lazy load into a 500 while debugging.
+    # nplusone 1.0 predates SQLAlchemy 2.1 and fails on import there, so any error
+    # just leaves it off.
+    try:
+        from nplusone.ext.flask_sqlalchemy import NPlusOne
+        app.config["NPLUSONE_LOG_LEVEL"] = logging.WARNING
+        NPlusOne(app)
+    except ImportError:
+        pass
+    except Exception as e:
+        app.logger.warning(f"nplusone could not be enabled, N+1 logging is off: {e}")
+# Enough pooled connections for the threaded server; in-memory SQLite uses a
+# single static connection and takes no pool sizing.
+if ":memory:" not in DB_URI and DB_URI not in ("sqlite://", "sqlite:///"):
+    pool_size = int(os.getenv("KANBAN_POOL_SIZE", max(THREADS, 10)))
+    engine_options = {"pool_size": pool_size, "max_overflow": 2 * pool_size}
+    if not DB_URI.startswith("sqlite"):
+        # Server databases drop idle connections; ping on checkout and recycle
+        engine_options.update(pool_pre_ping=True, pool_recycle=1800)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options
 
 db = SQLAlchemy()
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Auto‑migrate SQLite
 # ────────────────────────────────────────────────────────────────────────────────
-def ensure_columns() -> None:
-    if not DB_URI.startswith("sqlite:///"):
-        app.logger.debug("Database is not SQLite. Skipping auto-migration.")
+def sqlite_db_path() -> str | None:
+    """File the engine's SQLite database lives in, or None for other backends and
+    in-memory databases. Flask-SQLAlchemy resolves relative paths against the
+    instance folder, so the engine URL is used rather than DB_URI."""
+    url = db.engine.url
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return url.database
+
+def migrate_sqlite() -> None:
+    """Run every auto-migration step over one connection to an existing SQLite file"""
+    path = sqlite_db_path()
+    if path is None:
+        app.logger.debug("Database is not an SQLite file. Skipping auto-migration.")
         return
-    path = DB_URI.replace("sqlite:///", "", 1)
     if not os.path.exists(path):
         app.logger.debug(f"Database file {path} does not exist. Skipping auto-migration.")
         return
     
     app.logger.info(f"Auto-migration: Checking schema for existing SQLite database: {path}")
+    try:
+        # Autocommit driver mode: each step opens its own explicit write transaction
+        conn = sqlite3.connect(path, isolation_level=None)
+    except sqlite3.Error as e:
+        app.logger.error(f"Auto-migration: SQLite error: {e}")
+        return
+    try:
+        ensure_page_size(conn)
+        ensure_columns(conn)
+        ensure_phase2_tables(conn)
+    finally:
+        conn.close()
+
+def ensure_columns(conn: sqlite3.Connection) -> None:
     needed = {
         "card": {
             "start_date": "DATE", 
@@ -53,113 +145,190 @@ def ensure_columns() -> None:
             "is_active": "BOOLEAN DEFAULT 1"
         }
     }
-    conn = None
+    # Indexes declared on the models; create_all() only adds them to new tables
+    needed_indexes = {
+        "card": {
+            "ix_card_col_pos": "column_id, position",
+            "ix_card_col_archived_due_prio": "column_id, is_archived, due_date, priority",
+            "ix_card_archived": "id WHERE is_archived = 1",
+        },
+        "column": {
+            "ix_column_board_pos": "board_id, position",
+        },
+    }
+    # No longer used by any query
+    stale_indexes = ("ix_card_priority_due", "ix_card_due_date")
+    # Stamped into PRAGMA user_version once applied; changes whenever the specs above do
+    stamp = zlib.crc32(repr((needed, needed_indexes, stale_indexes)).encode()) & 0x7FFFFFFF
     try:
-        conn = sqlite3.connect(path)
+        # One explicit write transaction covers the schema inspection and
+        # every ALTER/CREATE INDEX below
         cur = conn.cursor()
+        if cur.execute("PRAGMA user_version").fetchone()[0] == stamp:
+            app.logger.debug("Auto-migration: Schema already up to date.")
+            return
+        cur.execute("BEGIN IMMEDIATE")
+        cur.execute("SELECT type, name FROM sqlite_master WHERE type IN (?, ?)", ("table", "index"))
+        schema = cur.fetchall()
+        existing_tables = {name for kind, name in schema if kind == "table"}
+        existing_indexes = {name for kind, name in schema if kind == "index"}
+
+        # Collect every missing column/index first, then apply them together
+        stmts = []
         for table_name, cols_to_add in needed.items():
-            cur.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table_name}';")
-            if not cur.fetchone():
+            if table_name not in existing_tables:
                 app.logger.warning(f"Auto-migration: Table '{table_name}' does not exist. Skipping.")
                 continue
-            cur.execute(f"PRAGMA table_info({table_name})")
-            existing_columns = {row[1] for row in cur.fetchall()}
+            cur.execute("SELECT name FROM pragma_table_info(?)", (table_name,))
+            existing_columns = {row[0] for row in cur.fetchall()}
             for col_name, col_definition in cols_to_add.items():
                 if col_name not in existing_columns:
                     app.logger.info(f"Auto-migration: Adding column '{col_name}' to '{table_name}'.")
-                    cur.execute(f"ALTER TABLE {table_name} ADD COLUMN {col_name} {col_definition}")
-        conn.commit()
+                    stmts.append(f"ALTER TABLE {table_name} ADD COLUMN {col_name} {col_definition}")
+        for table_name, indexes in needed_indexes.items():
+            if table_name not in existing_tables:
+                continue
+            for index_name, index_spec in indexes.items():
+                if index_name not in existing_indexes:
+                    # "cols WHERE cond" declares a partial index
+                    index_columns, _, where = index_spec.partition(" WHERE ")
+                    stmts.append(f'CREATE INDEX IF NOT EXISTS {index_name} ON "{table_name}" ({index_columns})'
+                                 + (f" WHERE {where}" if where else ""))
+        stmts.extend(f"DROP INDEX {name}" for name in stale_indexes if name in existing_indexes)
+        if stmts:
+            # Refresh planner statistics so the new indexes get picked
+            stmts.append("ANALYZE")
+        # executescript() would commit the open transaction first, so run the
+        # batch statement by statement inside it
+        for stmt in stmts:
+            cur.execute(stmt)
+        if existing_tables.issuperset(needed):
+            cur.execute(f"PRAGMA user_version={stamp}")
+        cur.execute("COMMIT")
         app.logger.info("Auto-migration: Schema migration commit successful.")
     except sqlite3.Error as e:
         app.logger.error(f"Auto-migration: SQLite error: {e}")
-        if conn: conn.rollback()
-    finally:
-        if conn: conn.close()
+        if conn.in_transaction: conn.rollback()
 
-def ensure_phase2_tables() -> None:
+def ensure_page_size(conn: sqlite3.Connection) -> None:
+    """Rebuild an existing database at SQLITE_PAGE_SIZE (WAL pins the page size, so leave it first)"""
+    try:
+        if conn.execute("PRAGMA page_size").fetchone()[0] == SQLITE_PAGE_SIZE:
+            return
+        app.logger.info(f"Auto-migration: Rebuilding database with page_size={SQLITE_PAGE_SIZE}.")
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.execute(f"PRAGMA page_size={SQLITE_PAGE_SIZE}")
+        conn.execute("VACUUM")
+    except sqlite3.Error as e:
+        app.logger.warning(f"Auto-migration: Could not change page_size: {e}")
+
+def ensure_phase2_tables(conn: sqlite3.Connection) -> None:
     """Create Phase 2 tables if they don't exist"""
-    if not DB_URI.startswith("sqlite:///"):
-        return
-    path = DB_URI.replace("sqlite:///", "", 1)
-    if not os.path.exists(path):
-        return
-    
     app.logger.info("Auto-migration: Checking Phase 2 tables")
-    conn = None
     try:
-        conn = sqlite3.connect(path)
+        # Same pattern as ensure_columns(): one write transaction for every CREATE
         cur = conn.cursor()
-        
-        # Check and create checklist table
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='checklist';")
-        if not cur.fetchone():
-            app.logger.info("Auto-migration: Creating checklist table")
-            cur.execute("""
-                CREATE TABLE checklist (
-                    id INTEGER PRIMARY KEY,
-                    card_id INTEGER NOT NULL,
-                    title VARCHAR(200) NOT NULL,
-                    position INTEGER DEFAULT 0,
-                    FOREIGN KEY (card_id) REFERENCES card(id)
-                )
-            """)
-        
-        # Check and create checklist_item table
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='checklist_item';")
-        if not cur.fetchone():
-            app.logger.info("Auto-migration: Creating checklist_item table")
-            cur.execute("""
-                CREATE TABLE checklist_item (
-                    id INTEGER PRIMARY KEY,
-                    checklist_id INTEGER NOT NULL,
-                    text TEXT NOT NULL,
-                    is_checked BOOLEAN DEFAULT 0,
-                    position INTEGER DEFAULT 0,
-                    FOREIGN KEY (checklist_id) REFERENCES checklist(id)
-                )
-            """)
-        
-        # Check and create attachment table
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='attachment';")
-        if not cur.fetchone():
-            app.logger.info("Auto-migration: Creating attachment table")
-            cur.execute("""
-                CREATE TABLE attachment (
-                    id INTEGER PRIMARY KEY,
-                    card_id INTEGER NOT NULL,
-                    filename VARCHAR(255) NOT NULL,
-                    original_filename VARCHAR(255) NOT NULL,
-                    file_path VARCHAR(500) NOT NULL,
-                    file_size INTEGER NOT NULL,
-                    mime_type VARCHAR(100) NOT NULL,
-                    uploaded_at DATETIME,
-                    FOREIGN KEY (card_id) REFERENCES card(id)
-                )
-            """)
-        
-        # Check and create card_template table
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='card_template';")
-        if not cur.fetchone():
-            app.logger.info("Auto-migration: Creating card_template table")
-            cur.execute("""
-                CREATE TABLE card_template (
-                    id INTEGER PRIMARY KEY,
-                    name VARCHAR(200) NOT NULL,
-                    description TEXT,
-                    template_data TEXT NOT NULL,
-                    created_at DATETIME,
-                    board_id INTEGER NOT NULL,
-                    FOREIGN KEY (board_id) REFERENCES board(id)
-                )
-            """)
-        
-        conn.commit()
+        cur.execute("BEGIN IMMEDIATE")
+        cur.execute(
+            f"SELECT name FROM sqlite_master WHERE type='table' AND name IN ({', '.join('?' * len(PHASE2_TABLES))})",
+            tuple(PHASE2_TABLES),
+        )
+        existing_tables = {row[0] for row in cur.fetchall()}
+        for table_name, ddl in PHASE2_TABLES.items():
+            if table_name not in existing_tables:
+                app.logger.info(f"Auto-migration: Creating {table_name} table")
+                cur.execute(ddl)
+        cur.execute("COMMIT")
         app.logger.info("Auto-migration: Phase 2 tables created successfully")
     except sqlite3.Error as e:
         app.logger.error(f"Auto-migration: SQLite error creating Phase 2 tables: {e}")
-        if conn: conn.rollback()
+        if conn.in_transaction: conn.rollback()
+
+PHASE2_TABLES = {
+    "checklist": """
+        CREATE TABLE checklist (
+            id INTEGER PRIMARY KEY,
+            card_id INTEGER NOT NULL,
+            title VARCHAR(200) NOT NULL,
+            position INTEGER DEFAULT 0,
+            FOREIGN KEY (card_id) REFERENCES card(id)
+        )
+    """,
+    "checklist_item": """
+        CREATE TABLE checklist_item (
+            id INTEGER PRIMARY KEY,
+            checklist_id INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            is_checked BOOLEAN DEFAULT 0,
+            position INTEGER DEFAULT 0,
+            FOREIGN KEY (checklist_id) REFERENCES checklist(id)
+        )
+    """,
+    "attachment": """
+        CREATE TABLE attachment (
+            id INTEGER PRIMARY KEY,
+            card_id INTEGER NOT NULL,
+            filename VARCHAR(255) NOT NULL,
+            original_filename VARCHAR(255) NOT NULL,
+            file_path VARCHAR(500) NOT NULL,
+            file_size INTEGER NOT NULL,
+            mime_type VARCHAR(100) NOT NULL,
+            uploaded_at DATETIME,
+            FOREIGN KEY (card_id) REFERENCES card(id)
+        )
+    """,
+    "card_template": """
+        CREATE TABLE card_template (
+            id INTEGER PRIMARY KEY,
+            name VARCHAR(200) NOT NULL,
+            description TEXT,
+            template_data TEXT NOT NULL,
+            created_at DATETIME,
+            board_id INTEGER NOT NULL,
+            FOREIGN KEY (board_id) REFERENCES board(id)
+        )
+    """,
+}
+
+# SQLite connection tuning
+# ────────────────────────────────────────────────────────────────────────────────
+SQLITE_PAGE_SIZE = 8192
+
+SQLITE_PRAGMAS = (
+    f"PRAGMA page_size={SQLITE_PAGE_SIZE}",  # only takes effect on a new, empty database
+    "PRAGMA journal_mode=WAL",    # readers no longer block on the writer
+    "PRAGMA synchronous=NORMAL",  # one fsync per checkpoint instead of two per commit
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",   # ~20 MB page cache
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",     # lets inserts/updates validate column ids without a lookup
+    "PRAGMA mmap_size=268435456", # serve reads from the OS page cache without read() syscalls
+)
+if WAL_CHECKPOINT_INTERVAL > 0:
+    # Commits no longer checkpoint inline; wal_checkpoint_loop() does it off the request path
+    SQLITE_PRAGMAS += ("PRAGMA wal_autocheckpoint=0",)
+
+def set_sqlite_pragmas(dbapi_conn, _conn_record) -> None:
+    """Apply SQLITE_PRAGMAS to every new pooled connection"""
+    cur = dbapi_conn.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cur.execute(pragma)
     finally:
-        if conn: conn.close()
+        cur.close()
+
+def wal_checkpoint_loop(path: str, interval: float) -> None:
+    """Periodically fold the WAL back into the database file from a daemon thread"""
+    while True:
+        time.sleep(interval)
+        conn = None
+        try:
+            conn = sqlite3.connect(path)
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except sqlite3.Error as e:
+            app.logger.warning(f"WAL checkpoint failed: {e}")
+        finally:
+            if conn: conn.close()
 
 # ORM models
 # ────────────────────────────────────────────────────────────────────────────────
@@ -180,6 +349,11 @@ class Column(db.Model):
     board_id = db.Column(db.Integer, db.ForeignKey("board.id"))
     cards = db.relationship("Card", backref="column", cascade="all, delete", order_by="Card.position") # Added order_by
 
+    __table_args__ = (
+        # Board lookups come back already in position order
+        db.Index("ix_column_board_pos", "board_id", "position"),
+    )
+
 class Card(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(128), nullable=False)
@@ -196,6 +370,15 @@ class Card(db.Model):
     checklists = db.relationship("Checklist", backref="card", cascade="all, delete-orphan", order_by="Checklist.position")
     attachments = db.relationship("Attachment", backref="card", cascade="all, delete-orphan", order_by="Attachment.uploaded_at")
 
+    # Cards are always read per column in position order; this also serves column_id lookups.
+    __table_args__ = (
+        db.Index("ix_card_col_pos", "column_id", "position"),
+        # Covers the metrics aggregates, so they never read the card rows
+        db.Index("ix_card_col_archived_due_prio", "column_id", "is_archived", "due_date", "priority"),
+        # Partial: only archived cards, for the archive listing
+        db.Index("ix_card_archived", "id", sqlite_where=db.text("is_archived = 1")),
+    )
+
 class Label(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(32), nullable=False)
@@ -240,80 +423,116 @@ class CardTemplate(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     board_id = db.Column(db.Integer, db.ForeignKey('board.id'), nullable=False)
 
+# Eager-load card children in one SELECT per relationship instead of
+# lazy-loading labels and checklists card by card (N+1).
+CARD_LOADERS = (
+    selectinload(Card.labels),
+    selectinload(Card.checklists).selectinload(Checklist.items),
+    selectinload(Card.attachments),
+)
+
 # DB init / seed
 # ────────────────────────────────────────────────────────────────────────────────
+@contextmanager
+def migration_lock():
+    """Hold an exclusive file lock next to the SQLite database, so only one
+    worker process migrates and seeds it at a time"""
+    path = sqlite_db_path()
+    if fcntl is None or path is None:
+        yield
+        return
+    with open(path + ".migrate.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def migrate_db() -> None:
+    """Bring the schema up to date and seed an empty database; safe to rerun"""
+    with migration_lock():
+        migrate_sqlite()
+        db.create_all()
+        app.logger.info("db.create_all() completed.")
+        try:
+            board_exists = db.session.query(Board).first()
+            if not board_exists:
+                app.logger.info("No board found, seeding initial data.")
+                board = Board(name="Kanban")
+                db.session.add(board)
+                db.session.flush()
+                default_columns = ["Backlog", "To Do", "In Progress", "Done"]
+                # Plain executemany: no Column instances and no per-row RETURNING
+                db.session.execute(insert(Column), [
+                    {"title": t, "position": i, "board_id": board.id} for i, t in enumerate(default_columns)
+                ])
+                db.session.commit()
+                app.logger.info("Initial data seeded.")
+            else:
+                app.logger.info(f"Existing board found (ID: {board_exists.id}), skipping seed.")
+        except Exception as e:
+            app.logger.error(f"Error during seeding: {e}")
+            db.session.rollback()   
+        finally:
+            db.session.remove()
+
+@app.cli.command("migrate")
+def migrate_command() -> None:
+    """Migrate and seed the database once, e.g. before starting workers with KANBAN_SKIP_MIGRATE=1"""
+    # Loading the app for the CLI already migrated, unless that was skipped
+    if SKIP_MIGRATE:
+        migrate_db()
+    click.echo("Database is up to date.")
+
 with app.app_context():
     app.logger.info("Entered app_context for DB initialization.")
-    ensure_columns()
-    ensure_phase2_tables() 
     db.init_app(app)
+    if DB_URI.startswith("sqlite"):
+        event.listen(db.engine, "connect", set_sqlite_pragmas)
     app.logger.info("SQLAlchemy initialized.")
-    db.create_all()
-    app.logger.info("db.create_all() completed.")
-
-    Session = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=db.engine))
-    temp_session = Session()
-    try:
-        board_exists = temp_session.query(Board).first()
-        if not board_exists:
-            app.logger.info("No board found, seeding initial data.")
-            board = Board(name="Kanban")
-            db.session.add(board)
-            db.session.flush() 
-            default_columns = ["Backlog", "To Do", "In Progress", "Done"]
-            for i, t in enumerate(default_columns):
-                db.session.add(Column(title=t, position=i, board_id=board.id)) 
-            db.session.commit()
-            app.logger.info("Initial data seeded.")
-        else:
-            app.logger.info(f"Existing board found (ID: {board_exists.id}), skipping seed.")
-    except Exception as e:
-        app.logger.error(f"Error during seeding: {e}")
-        temp_session.rollback() 
-        db.session.rollback()   
-    finally:
-        Session.remove() 
+    if SKIP_MIGRATE:
+        app.logger.info("KANBAN_SKIP_MIGRATE set, skipping migration and seed.")
+    else:
+        migrate_db()
+    if sqlite_db_path() and WAL_CHECKPOINT_INTERVAL > 0:
+        threading.Thread(
+            target=wal_checkpoint_loop,
+            args=(sqlite_db_path(), WAL_CHECKPOINT_INTERVAL),
+            name="wal-checkpoint", daemon=True,
+        ).start()
     app.logger.info("Exited app_context for DB initialization.")
 
 # Helpers
 # ────────────────────────────────────────────────────────────────────────────────
 PRIO_MAP = {1: "High", 2: "Medium", 3: "Low"}
 
+_PRIO_GET = PRIO_MAP.get
+_PRIO_KEYS = tuple(PRIO_MAP)
+_PRIO_LABELS = tuple(PRIO_MAP.values())
+_PRIO_SET = frozenset(PRIO_MAP)
+_PRIO_ERR = {"error": f"Priority must be one of {list(PRIO_MAP)}"}
+_PRIO_TYPE_ERR = {"error": f"Priority must be an integer ({list(PRIO_MAP)})"}
+
 def parse_date(s: str | None):
-    try: return datetime.strptime(s, "%Y-%m-%d").date() if s else None
+    try: return date.fromisoformat(s) if s else None
     except ValueError: return None
 
+_CARD_FIELDS = attrgetter("id", "title", "description", "position", "column_id",
+                          "start_date", "due_date", "priority", "is_archived")
+
 def card_to_dict(card: Card) -> Dict:
+    i, t, d, pos, cid, sd, dd, p, arch = _CARD_FIELDS(card)
     return {
-        "id": card.id, "title": card.title, "description": card.description,
-        "position": card.position, "column_id": card.column_id,
-        "start_date": card.start_date.isoformat() if card.start_date else None,
-        "due_date": card.due_date.isoformat() if card.due_date else None,
-        "priority": card.priority, "priority_name": PRIO_MAP.get(card.priority, "N/A"),
-        "is_archived": card.is_archived,
+        "id": i, "title": t, "description": d,
+        "position": pos, "column_id": cid,
+        "start_date": sd, "due_date": dd,
+        "priority": p, "priority_name": _PRIO_GET(p, "N/A"),
+        "is_archived": arch,
         "labels": [label_to_dict(label) for label in card.labels],
         "checklists": [checklist_to_dict(checklist) for checklist in card.checklists],
         "attachments": [attachment_to_dict(attachment) for attachment in card.attachments]
     }
 
-def column_to_dict(col: Column) -> Dict:
-    return {
-        "id": col.id, "title": col.title, "position": col.position,
-        "cards": sorted([card_to_dict(c) for c in col.cards if not c.is_archived], key=lambda x: x["position"])
-    }
-
-def board_to_dict(board: Board) -> Dict:
-    return {
-        "id": board.id,
-        "name": board.name,
-        "description": board.description,
-        "created_at": board.created_at.isoformat() if board.created_at else None,
-        "updated_at": board.updated_at.isoformat() if board.updated_at else None,
-        "is_active": board.is_active,
-        "columns": sorted([column_to_dict(c) for c in board.columns], key=lambda x: x["position"]),
-        "labels": [label_to_dict(label) for label in board.labels]
-    }
-
 def label_to_dict(label: Label) -> Dict:
     return {
         "id": label.id,
@@ -344,7 +563,7 @@ def attachment_to_dict(attachment: Attachment) -> Dict:
         "original_filename": attachment.original_filename,
         "file_size": attachment.file_size,
         "mime_type": attachment.mime_type,
-        "uploaded_at": attachment.uploaded_at.isoformat() if attachment.uploaded_at else None
+        "uploaded_at": attachment.uploaded_at
     }
 
 def card_template_to_dict(template: CardTemplate) -> Dict:
@@ -352,16 +571,154 @@ def card_template_to_dict(template: CardTemplate) -> Dict:
         "id": template.id,
         "name": template.name,
         "description": template.description,
-        "created_at": template.created_at.isoformat() if template.created_at else None
+        "created_at": template.created_at
     }
 
+# Board response cache
+# ────────────────────────────────────────────────────────────────────────────────
+# Every successful mutation bumps the version; board and metrics GETs are
+# served from serialized bytes keyed on it, and board GETs answer 304 when the
+# client's ETag matches.
+# The version lives in this process, so the app must be served by one
+# multi-threaded process rather than several workers.
+_BOOT_ID = uuid.uuid4().hex[:8]  # Keeps ETags from matching across restarts
+_board_state = {"version": 0}
+_board_lock = threading.Lock()
+
+def bump_board_version() -> None:
+    with _board_lock:
+        _board_state["version"] += 1
+    # Older versions can never be requested again; drop their bytes now
+    board_data.cache_clear()
+    board_json.cache_clear()
+    metrics_json.cache_clear()
+
+@event.listens_for(db.session, "after_commit")
+def track_mutations(session) -> None:
+    # Every write goes through a session commit, including handlers that commit
+    # and then fail, so the caches and ETags never outlive the data they describe
+    bump_board_version()
+
+def board_etag() -> str:
+    return f"{_BOOT_ID}-{_board_state['version']}"
+
+def _group_rows(rows, key: str) -> Dict[int, List[Dict]]:
+    grouped: Dict[int, List[Dict]] = {}
+    for row in rows:
+        row = dict(row)
+        grouped.setdefault(row.pop(key), []).append(row)
+    return grouped
+
+def board_payload(board_id: int) -> Dict | None:
+    """Full board (columns, non-archived cards in position order, labels) from plain rows.
+
+    Cards leave out card_to_dict()'s is_archived (always false here) and
+    priority_name (the client maps priorities itself).
+    """
+    b = db.session.execute(
+        select(Board.id, Board.name, Board.description, Board.created_at,
+               Board.updated_at, Board.is_active).where(Board.id == board_id)
+    ).mappings().first()
+    if not b: return None
+
+    on_board = (Column.board_id == b["id"], Card.is_archived == False)
+    columns = db.session.execute(
+        select(Column.id, Column.title, Column.position)
+        .where(Column.board_id == b["id"]).order_by(Column.position)
+    ).mappings().all()
+    cards = db.session.execute(
+        select(Card.id, Card.title, Card.description, Card.position, Card.column_id,
+               Card.start_date, Card.due_date, Card.priority)
+        .join(Column).where(*on_board).order_by(Card.position)
+    ).mappings().all()
+
+    labels = checklists = items = attachments = {}
+    if cards:
+        labels = _group_rows(db.session.execute(
+            select(card_labels.c.card_id, Label.id, Label.name, Label.color)
+            .join(Label, Label.id == card_labels.c.label_id)
+            .join(Card, Card.id == card_labels.c.card_id).join(Column).where(*on_board)
+        ).mappings(), "card_id")
+        checklists = _group_rows(db.session.execute(
+            select(Checklist.card_id, Checklist.id, Checklist.title, Checklist.position)
+            .join(Card).join(Column).where(*on_board).order_by(Checklist.position)
+        ).mappings(), "card_id")
+        if checklists:
+            items = _group_rows(db.session.execute(
+                select(ChecklistItem.checklist_id, ChecklistItem.id, ChecklistItem.text,
+                       ChecklistItem.is_checked, ChecklistItem.position)
+                .join(Checklist).join(Card).join(Column).where(*on_board)
+                .order_by(ChecklistItem.position)
+            ).mappings(), "checklist_id")
+        attachments = _group_rows(db.session.execute(
+            select(Attachment.card_id, Attachment.id, Attachment.filename,
+                   Attachment.original_filename, Attachment.file_size, Attachment.mime_type,
+                   Attachment.uploaded_at)
+            .join(Card).join(Column).where(*on_board).order_by(Attachment.uploaded_at)
+        ).mappings(), "card_id")
+
+    for cl_list in checklists.values():
+        for cl in cl_list:
+            cl["items"] = items.get(cl["id"], [])
+
+    by_column: Dict[int, List[Dict]] = {}
+    for c in cards:
+        by_column.setdefault(c["column_id"], []).append({
+            **c,
+            "labels": labels.get(c["id"], []),
+            "checklists": checklists.get(c["id"], []),
+            "attachments": attachments.get(c["id"], []),
+        })
+    board_labels = [dict(row) for row in db.session.execute(
+        select(Label.id, Label.name, Label.color).where(Label.board_id == b["id"])
+    ).mappings()]
+    return {
+        "id": b["id"], "name": b["name"], "description": b["description"],
+        "created_at": b["created_at"], "updated_at": b["updated_at"],
+        "is_active": b["is_active"],
+        "columns": [{**col, "cards": by_column.get(col["id"], [])} for col in columns],
+        "labels": board_labels,
+    }
+
+@lru_cache(maxsize=16)
+def board_data(board_id: int, version: int) -> Dict | None:
+    """board_payload() built once per version, shared by both board endpoints (read-only)"""
+    return board_payload(board_id)
+
+@lru_cache(maxsize=16)
+def board_json(board_id: int | None, version: int) -> bytes | None:
+    """Serialized board payload; board_id None is the legacy first-board shape {id, name, columns}"""
+    if board_id is None:
+        first_id = db.session.scalar(select(Board.id).order_by(Board.id).limit(1))
+        data = None if first_id is None else board_data(first_id, version)
+        return None if data is None else json_bytes(
+            {"id": data["id"], "name": data["name"], "columns": data["columns"]})
+    data = board_data(board_id, version)
+    return None if data is None else json_bytes(data)
+
+def board_response(board_id: int | None):
+    etag = board_etag()
+    if request.if_none_match.contains_weak(etag):
+        resp = app.response_class(status=304)
+    else:
+        body = board_json(board_id, _board_state["version"])
+        if body is None:
+            return None
+        resp = app.response_class(body, mimetype="application/json")
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
 # API routes
 # ────────────────────────────────────────────────────────────────────────────────
 @app.get("/api/boards")
 def api_boards():
     app.logger.debug("GET /api/boards called")
-    boards = Board.query.filter_by(is_active=True).all()
-    return jsonify([{"id": b.id, "name": b.name, "description": b.description} for b in boards])
+    # Only the listed fields, as plain rows: no Board instances
+    boards = db.session.execute(
+        select(Board.id, Board.name, Board.description).where(Board.is_active == True)
+    ).mappings()
+    return jsonify([dict(b) for b in boards])
 
 @app.post("/api/boards")
 def api_create_board():
@@ -376,16 +733,17 @@ def api_create_board():
     
     # Add default columns
     default_columns = ["Backlog", "To Do", "In Progress", "Done"]
-    for i, t in enumerate(default_columns):
-        db.session.add(Column(title=t, position=i, board_id=board.id))
+    db.session.execute(insert(Column), [
+        {"title": t, "position": i, "board_id": board.id} for i, t in enumerate(default_columns)
+    ])
     
     db.session.commit()
-    return jsonify(board_to_dict(board))
+    return jsonify(board_payload(board.id))
 
 @app.put("/api/boards/<int:board_id>")
 def api_update_board(board_id):
     app.logger.debug(f"PUT /api/boards/{board_id} called")
-    board = Board.query.get_or_404(board_id)
+    board = db.get_or_404(Board, board_id)
     data = request.json or {}
     
     if "name" in data:
@@ -395,12 +753,12 @@ def api_update_board(board_id):
     
     board.updated_at = datetime.utcnow()
     db.session.commit()
-    return jsonify(board_to_dict(board))
+    return jsonify(board_payload(board.id))
 
 @app.delete("/api/boards/<int:board_id>")
 def api_delete_board(board_id):
     app.logger.debug(f"DELETE /api/boards/{board_id} called")
-    board = Board.query.get_or_404(board_id)
+    board = db.get_or_404(Board, board_id)
     
     # Don't delete the last board
     if Board.query.filter_by(is_active=True).count() <= 1:
@@ -414,18 +772,13 @@ def api_delete_board(board_id):
 @app.get("/api/board/<int:board_id>")
 def api_board_data(board_id):
     app.logger.debug(f"GET /api/board/{board_id} called")
-    b = Board.query.get_or_404(board_id)
-    return jsonify(board_to_dict(b))
+    return board_response(board_id) or abort(404)
 
 # Legacy endpoint for backward compatibility
 @app.get("/api/board")
 def api_board_data_legacy():
     app.logger.debug("GET /api/board called (legacy)")
-    b = Board.query.first()
-    if not b: return jsonify({"error": "Board not found"}), 404
-    # Ensure columns are ordered by position for consistent display
-    ordered_columns = sorted([column_to_dict(c) for c in b.columns], key=lambda x: x["position"])
-    return jsonify({"id": b.id, "name": b.name, "columns": ordered_columns})
+    return board_response(None) or (jsonify({"error": "Board not found"}), 404)
 
 
 
@@ -434,79 +787,97 @@ def api_board_data_legacy():
 def api_metrics():
     app.logger.debug("GET /api/metrics called")
     # Get current board (default to first board for legacy compatibility)
-    current_board = Board.query.first()
-    if not current_board:
+    resp = metrics_response(None)
+    if resp is None:
         return jsonify({"error": "No board found"}), 404
-    
-    return _get_board_metrics(current_board.id)
+    return resp
 
 @app.get("/api/metrics/<int:board_id>")
 def api_metrics_board(board_id):
     app.logger.debug(f"GET /api/metrics/{board_id} called")
-    current_board = Board.query.get(board_id)
-    if not current_board:
+    resp = metrics_response(board_id)
+    if resp is None:
         return jsonify({"error": "Board not found"}), 404
-    
-    return _get_board_metrics(board_id)
+    return resp
 
-def _get_board_metrics(board_id):
-    current_board = Board.query.get(board_id)
-    if not current_board:
-        return jsonify({"error": "Board not found"}), 404
-    
+def metrics_response(board_id: int | None):
     today = date.today()
+    etag = f"{board_etag()}-{today.isoformat()}"
+    if request.if_none_match.contains_weak(etag):
+        resp = app.response_class(status=304)
+    else:
+        body = metrics_json(board_id, _board_state["version"], today)
+        if body is None:
+            return None
+        resp = app.response_class(body, mimetype="application/json")
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+@lru_cache(maxsize=16)
+def metrics_json(board_id: int | None, version: int, today: date) -> bytes | None:
+    """Serialized metrics; keyed on the board version and the day, since due-date counts roll over"""
+    if board_id is None:
+        board_id = db.session.scalar(select(Board.id).order_by(Board.id).limit(1))
+    data = board_metrics(board_id, today) if board_id is not None else None
+    return None if data is None else json_bytes(data)
+
+def board_metrics(board_id: int, today: date) -> Dict | None:
     next_7_days_end = today + timedelta(days=7)
 
-    # Filter cards by current board, excluding archived cards
-    board_cards_query = Card.query.join(Column).filter(Column.board_id == current_board.id, Card.is_archived == False)
-    board_columns = Column.query.filter_by(board_id=current_board.id)
-    
-    total_cards_count = board_cards_query.count()
-    total_columns_count = board_columns.count()
-    
-    avg_cards_per_column = (total_cards_count / total_columns_count) if total_columns_count > 0 else 0
-
-    priority_counts = {p_val: board_cards_query.filter(Card.priority == p_val).count() for p_val in PRIO_MAP.keys()}
-    # Ensure all priorities are present in percentages, even if count is 0
-    priority_percentages = {}
-    for p_val, p_name in PRIO_MAP.items():
-        count = priority_counts.get(p_val, 0)
-        priority_percentages[p_name] = (count / total_cards_count * 100) if total_cards_count > 0 else 0
+    # One row per column (empty columns included) with its card count
+    column_rows = db.session.execute(
+        select(Column.id, Column.title, func.count(Card.id))
+        .outerjoin(Card, and_(Card.column_id == Column.id, Card.is_archived == False))
+        .where(Column.board_id == board_id)
+        .group_by(Column.id)
+        .order_by(Column.position)
+    ).all()
+    # No columns may also mean no such board; only then is the board looked up
+    if not column_rows and db.session.get(Board, board_id) is None:
+        return None
+    total_cards_count = sum(count for _, _, count in column_rows)
+
+    if total_cards_count:
+        # Every card-level count in one pass over the board's non-archived cards
+        overdue = and_(Card.due_date != None, Card.due_date < today)
+        card_row = db.session.execute(
+            select(
+                *(func.count(case((Card.priority == key, 1))) for key in _PRIO_KEYS),
+                func.count(case((overdue, 1))),
+                func.count(case((and_(overdue, Card.priority == 1), 1))),
+                func.count(case((Card.due_date == today, 1))),
+                func.count(case((and_(Card.due_date >= today, Card.due_date < next_7_days_end), 1))),
+            ).join(Column).where(Column.board_id == board_id, Card.is_archived == False)
+        ).one()
+    else:
+        # Empty board: every card-level count is zero, skip the query
+        card_row = (0,) * (len(_PRIO_KEYS) + 4)
+    priority_counts = card_row[:len(_PRIO_KEYS)]
+    overdue_cards_count, overdue_high_priority_count, cards_due_today_count, cards_due_next_7_days_count = card_row[len(_PRIO_KEYS):]
 
-    priority_counts_named = {PRIO_MAP[p_val]: count for p_val, count in priority_counts.items()}
+    total_columns_count = len(column_rows)
 
-    overdue_cards_count = board_cards_query.filter(Card.due_date != None, Card.due_date < today).count()
-    overdue_high_priority_count = board_cards_query.filter(
-        Card.priority == 1, Card.due_date != None, Card.due_date < today
-    ).count()
-    
-    cards_due_today_count = board_cards_query.filter(Card.due_date == today).count()
-    cards_due_next_7_days_count = board_cards_query.filter(
-        Card.due_date != None, Card.due_date >= today, Card.due_date < next_7_days_end
-    ).count()
+    avg_cards_per_column = (total_cards_count / total_columns_count) if total_columns_count > 0 else 0
 
-    done_column = board_columns.filter(Column.title.ilike("Done")).first()
-    if not done_column: 
-        done_column = board_columns.order_by(Column.position.desc()).first()
+    # Cards in the "Done" column count as completed; fall back to the last column
+    done_row = next((row for row in column_rows if row[1].lower() == "done"), None)
+    if not done_row and column_rows:
+        done_row = column_rows[-1]
+    cards_in_done_column_count = done_row[2] if done_row else 0
 
-    cards_in_done_column_count = 0
-    if done_column:
-        cards_in_done_column_count = board_cards_query.filter(Card.column_id == done_column.id).count()
-    
     active_cards_count = total_cards_count - cards_in_done_column_count
-    
-    all_columns = board_columns.order_by(Column.position).all()
+
     column_details: List[Dict[str, Any]] = []
-    for col in all_columns:
-        card_count_in_col = board_cards_query.filter(Card.column_id == col.id).count()
+    for _, title, card_count_in_col in column_rows:
         percentage = (card_count_in_col / total_cards_count * 100) if total_cards_count > 0 else 0
         column_details.append({
-            "name": col.title,
+            "name": title,
             "card_count": card_count_in_col,
             "percentage_of_total": round(percentage, 1)
         })
 
-    return jsonify({
+    return {
         "overall_stats": {
             "total_cards": total_cards_count,
             "total_columns": total_columns_count,
@@ -515,8 +886,8 @@ def _get_board_metrics(board_id):
             "completed_cards": cards_in_done_column_count,
         },
         "priority_insights": { # This structure is good for a pie chart
-            "labels": list(PRIO_MAP.values()), # e.g., ["High", "Medium", "Low"]
-            "counts": [priority_counts.get(key, 0) for key in PRIO_MAP.keys()], # e.g., [count_high, count_med, count_low]
+            "labels": _PRIO_LABELS, # e.g., ["High", "Medium", "Low"]
+            "counts": list(priority_counts), # e.g., [count_high, count_med, count_low]
             "overdue_high_priority": overdue_high_priority_count, # Keep this as a separate prominent number
         },
         "due_date_insights": {
@@ -525,7 +896,7 @@ def _get_board_metrics(board_id):
             "due_next_7_days": cards_due_next_7_days_count,
         },
         "column_breakdown": column_details, # Good for a bar chart
-    })
+    }
 
 @app.post("/api/column")
 def api_add_column():
@@ -534,35 +905,47 @@ def api_add_column():
     title = data.get("title", "Untitled")
     board_id = data.get("board_id")
     
-    # If no board_id provided, use the first board for backward compatibility
-    if board_id:
-        board = Board.query.get(board_id)
-    else:
+    # If no board_id provided, use the first board for backward compatibility;
+    # an explicit id is checked by the foreign key on insert
+    if not board_id:
         board = Board.query.first()
-        
-    if not board:
+        if not board:
+            app.logger.warning("/api/column: Board not found")
+            return jsonify({"error": "Board not found, cannot add column"}), 404
+        board_id = board.id
+
+    # Position and insert in one statement; RETURNING hands back the new row
+    next_pos = (select(func.coalesce(func.max(Column.position), -1) + 1)
+                .where(Column.board_id == board_id).scalar_subquery())
+    try:
+        row = db.session.execute(
+            insert(Column).values(title=title, position=next_pos, board_id=board_id)
+            .returning(Column.id, Column.title, Column.position)
+        ).mappings().one()
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
         app.logger.warning("/api/column: Board not found")
         return jsonify({"error": "Board not found, cannot add column"}), 404
-    
-    max_pos = db.session.query(db.func.max(Column.position)).filter_by(board_id=board.id).scalar()
-    new_pos = (max_pos + 1) if max_pos is not None else 0
-
-    col = Column(title=title, position=new_pos, board_id=board.id) 
-    db.session.add(col); db.session.commit()
-    app.logger.info(f"/api/column: Column '{title}' added at position {new_pos}.")
-    return jsonify(column_to_dict(col)), 201
+    app.logger.info(f"/api/column: Column '{title}' added at position {row['position']}.")
+    return jsonify({**row, "cards": []}), 201
 
 # Label endpoints
 @app.get("/api/boards/<int:board_id>/labels")
 def api_get_labels(board_id):
     app.logger.debug(f"GET /api/boards/{board_id}/labels called")
-    board = Board.query.get_or_404(board_id)
-    return jsonify([label_to_dict(label) for label in board.labels])
+    labels = db.session.execute(
+        select(Label.id, Label.name, Label.color).where(Label.board_id == board_id)
+    ).mappings().all()
+    # No labels may also mean no such board; only then is the board looked up
+    if not labels:
+        db.get_or_404(Board, board_id)
+    return jsonify([dict(label) for label in labels])
 
 @app.post("/api/boards/<int:board_id>/labels")
 def api_create_label(board_id):
     app.logger.debug(f"POST /api/boards/{board_id}/labels called")
-    board = Board.query.get_or_404(board_id)
+    board = db.get_or_404(Board, board_id)
     data = request.json or {}
     
     name = data.get("name", "").strip()
@@ -582,7 +965,7 @@ def api_create_label(board_id):
 @app.put("/api/labels/<int:label_id>")
 def api_update_label(label_id):
     app.logger.debug(f"PUT /api/labels/{label_id} called")
-    label = Label.query.get_or_404(label_id)
+    label = db.get_or_404(Label, label_id)
     data = request.json or {}
     
     if "name" in data:
@@ -603,7 +986,7 @@ def api_update_label(label_id):
 @app.delete("/api/labels/<int:label_id>")
 def api_delete_label(label_id):
     app.logger.debug(f"DELETE /api/labels/{label_id} called")
-    label = Label.query.get_or_404(label_id)
+    label = db.get_or_404(Label, label_id)
     db.session.delete(label)
     db.session.commit()
     return jsonify({"success": True})
@@ -612,13 +995,13 @@ def api_delete_label(label_id):
 @app.get("/api/cards/archived")
 def api_get_archived_cards():
     app.logger.debug("GET /api/cards/archived called")
-    cards = Card.query.filter_by(is_archived=True).all()
+    cards = Card.query.options(*CARD_LOADERS).filter_by(is_archived=True).all()
     return jsonify([card_to_dict(card) for card in cards])
 
 @app.post("/api/cards/<int:card_id>/archive")
 def api_archive_card(card_id):
     app.logger.debug(f"POST /api/cards/{card_id}/archive called")
-    card = Card.query.get_or_404(card_id)
+    card = db.get_or_404(Card, card_id)
     card.is_archived = True
     card.updated_at = datetime.utcnow()
     db.session.commit()
@@ -627,7 +1010,7 @@ def api_archive_card(card_id):
 @app.post("/api/cards/<int:card_id>/unarchive")
 def api_unarchive_card(card_id):
     app.logger.debug(f"POST /api/cards/{card_id}/unarchive called")
-    card = Card.query.get_or_404(card_id)
+    card = db.get_or_404(Card, card_id)
     card.is_archived = False
     card.updated_at = datetime.utcnow()
     db.session.commit()
@@ -642,43 +1025,53 @@ def api_card(cid: int | None = None):
         app.logger.debug(f"POST /api/card called with data: {data}")
         column_id_val = data.get("column_id")
         if column_id_val is None: return jsonify({"error": "column_id is required"}), 400
-        target_column = Column.query.get(column_id_val)
-        if not target_column: return jsonify({"error": f"Column with id {column_id_val} not found"}), 404
+        try:
+            if isinstance(column_id_val, bool): raise TypeError
+            column_id_val = int(column_id_val)
+        except (ValueError, TypeError):
+            return jsonify({"error": f"Column with id {column_id_val} not found"}), 404
 
         raw_priority = data.get("priority", "2") 
         try:
             priority_val = int(raw_priority)
-            if priority_val not in PRIO_MAP.keys(): return jsonify({"error": f"Priority must be one of {list(PRIO_MAP.keys())}"}), 400
-        except (ValueError, TypeError): return jsonify({"error": f"Priority must be an integer ({list(PRIO_MAP.keys())})"}), 400
+            if priority_val not in _PRIO_SET: return jsonify(_PRIO_ERR), 400
+        except (ValueError, TypeError): return jsonify(_PRIO_TYPE_ERR), 400
 
         title = data.get("title", "").strip()
         if not title: title = "Untitled Card"
 
-        max_card_pos = db.session.query(db.func.max(Card.position)).filter_by(column_id=column_id_val).scalar()
-        new_card_pos = (max_card_pos + 1) if max_card_pos is not None else 0
+        # Next position is computed inside the INSERT itself: no extra round-trip
+        # and no window for two concurrent creates to pick the same slot
+        next_pos = (select(func.coalesce(func.max(Card.position), -1) + 1)
+                    .where(Card.column_id == column_id_val).scalar_subquery())
 
         card = Card(
             title=title, description=data.get("description", ""), column_id=column_id_val, 
-            position=new_card_pos, 
+            position=next_pos, 
             start_date=parse_date(data.get("start_date")), due_date=parse_date(data.get("due_date")),
             priority=priority_val, 
         )
-        db.session.add(card)
-        db.session.flush()  # Get card ID before handling labels
-        
-        # Handle labels if provided
+        # Labels are resolved before the INSERT so one flush writes everything
         label_ids = data.get("label_ids", [])
-        if label_ids:
-            labels = Label.query.filter(Label.id.in_(label_ids)).all()
-            card.labels = labels
-        
+        card.labels = Label.query.filter(Label.id.in_(label_ids)).all() if label_ids else []
+        card.checklists, card.attachments = [], []  # New card: nothing to lazy-load
+        db.session.add(card)
+        try:
+            db.session.flush()  # The FK rejects an unknown column
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"error": f"Column with id {column_id_val} not found"}), 404
+
+        # Serialize before commit() expires the instance; only position (computed
+        # in the INSERT) has to be read back
+        payload = card_to_dict(card)
         db.session.commit()
-        app.logger.info(f"/api/card (POST): Card '{card.title}' created with id {card.id}.")
-        return jsonify(card_to_dict(card)), 201
+        app.logger.info(f"/api/card (POST): Card '{title}' created with id {payload['id']}.")
+        return jsonify(payload), 201
     
     # PATCH
     app.logger.debug(f"PATCH /api/card/{cid} called with data: {data}")
-    card = Card.query.get_or_404(cid)
+    card = db.get_or_404(Card, cid)
     
     if "title" in data:
         title_val = data["title"].strip()
@@ -687,9 +1080,12 @@ def api_card(cid: int | None = None):
 
     if "description" in data: card.description = data["description"]
     if "column_id" in data:
-        target_column_patch = Column.query.get(data["column_id"])
-        if not target_column_patch: return jsonify({"error": f"Target column {data['column_id']} not found"}), 404
-        card.column_id = data["column_id"]
+        # Only the type is checked here; the FK rejects unknown ids on flush
+        try:
+            if data["column_id"] is None or isinstance(data["column_id"], bool): raise TypeError
+            card.column_id = int(data["column_id"])
+        except (ValueError, TypeError):
+            return jsonify({"error": f"Target column {data['column_id']} not found"}), 404
     if "position" in data: card.position = data["position"]
             
     if "start_date" in data: card.start_date = parse_date(data["start_date"])
@@ -701,27 +1097,60 @@ def api_card(cid: int | None = None):
         else:
             try:
                 priority_val = int(raw_priority)
-                if priority_val not in PRIO_MAP.keys(): return jsonify({"error": f"Priority must be one of {list(PRIO_MAP.keys())}"}), 400
+                if priority_val not in _PRIO_SET: return jsonify(_PRIO_ERR), 400
                 card.priority = priority_val
-            except (ValueError, TypeError): return jsonify({"error": f"Priority must be an integer ({list(PRIO_MAP.keys())})"}), 400
+            except (ValueError, TypeError): return jsonify(_PRIO_TYPE_ERR), 400
     
-    # Handle labels update
+    # Handle labels update (without flushing a possibly invalid column_id early).
+    # The current labels are loaded for the response anyway; an unchanged set
+    # needs no label lookup and no card_labels writes.
     if "label_ids" in data:
-        label_ids = data["label_ids"]
-        if label_ids:
-            labels = Label.query.filter(Label.id.in_(label_ids)).all()
-            card.labels = labels
-        else:
-            card.labels = []
+        label_ids = set(data["label_ids"] or ())
+        with db.session.no_autoflush:
+            if label_ids != {label.id for label in card.labels}:
+                card.labels = Label.query.filter(Label.id.in_(label_ids)).all() if label_ids else []
     
+    try:
+        db.session.flush()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"error": f"Target column {data['column_id']} not found"}), 404
+    # Serialize before commit() expires the instance, saving a reload SELECT
+    payload = card_to_dict(card)
     db.session.commit()
     app.logger.info(f"/api/card (PATCH): Card {cid} updated.")
-    return jsonify(card_to_dict(card))
+    return jsonify(payload)
+
+@app.post("/api/reorder")
+def api_reorder_cards():
+    """Move/reorder many cards in one transaction; body is [{id, column_id, position}, ...]"""
+    app.logger.debug("POST /api/reorder called")
+    items = request.json
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "Expected a non-empty list of {id, column_id, position}"}), 400
+    try:
+        rows = [{"id": int(i["id"]), "column_id": int(i["column_id"]), "position": int(i["position"])} for i in items]
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Each item needs integer id, column_id and position"}), 400
+
+    try:
+        db.session.execute(update(Card), rows)  # executemany UPDATE ... WHERE id = :id
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"error": "Target column not found"}), 404
+    except StaleDataError:
+        db.session.rollback()
+        return jsonify({"error": "Card not found"}), 404
+
+    board_id = db.session.scalar(select(Column.board_id).where(Column.id == rows[0]["column_id"]))
+    app.logger.info(f"/api/reorder: {len(rows)} cards repositioned.")
+    return jsonify(board_payload(board_id))
 
 @app.delete("/api/card/<int:cid>")
 def api_delete_card(cid):
     app.logger.debug(f"DELETE /api/card/{cid} called")
-    card = Card.query.get_or_404(cid)
+    card = db.get_or_404(Card, cid)
     db.session.delete(card); db.session.commit()
     app.logger.info(f"/api/card (DELETE): Card {cid} deleted.")
     return "", 204
@@ -733,13 +1162,15 @@ def api_delete_card(cid):
 @app.get("/api/cards/<int:card_id>/checklists")
 def api_get_checklists(card_id):
     app.logger.debug(f"GET /api/cards/{card_id}/checklists called")
-    card = Card.query.get_or_404(card_id)
-    return jsonify([checklist_to_dict(checklist) for checklist in card.checklists])
+    db.get_or_404(Card, card_id)
+    checklists = (Checklist.query.options(selectinload(Checklist.items))
+                  .filter_by(card_id=card_id).order_by(Checklist.position).all())
+    return jsonify([checklist_to_dict(checklist) for checklist in checklists])
 
 @app.post("/api/cards/<int:card_id>/checklists")
 def api_create_checklist(card_id):
     app.logger.debug(f"POST /api/cards/{card_id}/checklists called")
-    card = Card.query.get_or_404(card_id)
+    card = db.get_or_404(Card, card_id)
     data = request.json or {}
     title = data.get("title", "New Checklist")
     position = data.get("position", len(card.checklists))
@@ -753,7 +1184,7 @@ def api_create_checklist(card_id):
 @app.put("/api/checklists/<int:checklist_id>")
 def api_update_checklist(checklist_id):
     app.logger.debug(f"PUT /api/checklists/{checklist_id} called")
-    checklist = Checklist.query.get_or_404(checklist_id)
+    checklist = db.get_or_404(Checklist, checklist_id)
     data = request.json or {}
     
     if "title" in data:
@@ -767,7 +1198,7 @@ def api_update_checklist(checklist_id):
 @app.delete("/api/checklists/<int:checklist_id>")
 def api_delete_checklist(checklist_id):
     app.logger.debug(f"DELETE /api/checklists/{checklist_id} called")
-    checklist = Checklist.query.get_or_404(checklist_id)
+    checklist = db.get_or_404(Checklist, checklist_id)
     db.session.delete(checklist)
     db.session.commit()
     return "", 204
@@ -776,7 +1207,7 @@ def api_delete_checklist(checklist_id):
 @app.post("/api/checklists/<int:checklist_id>/items")
 def api_create_checklist_item(checklist_id):
     app.logger.debug(f"POST /api/checklists/{checklist_id}/items called")
-    checklist = Checklist.query.get_or_404(checklist_id)
+    checklist = db.get_or_404(Checklist, checklist_id)
     data = request.json or {}
     text = data.get("text", "")
     position = data.get("position", len(checklist.items))
@@ -790,7 +1221,7 @@ def api_create_checklist_item(checklist_id):
 @app.put("/api/checklist-items/<int:item_id>")
 def api_update_checklist_item(item_id):
     app.logger.debug(f"PUT /api/checklist-items/{item_id} called")
-    item = ChecklistItem.query.get_or_404(item_id)
+    item = db.get_or_404(ChecklistItem, item_id)
     data = request.json or {}
     
     if "text" in data:
@@ -806,7 +1237,7 @@ def api_update_checklist_item(item_id):
 @app.delete("/api/checklist-items/<int:item_id>")
 def api_delete_checklist_item(item_id):
     app.logger.debug(f"DELETE /api/checklist-items/{item_id} called")
-    item = ChecklistItem.query.get_or_404(item_id)
+    item = db.get_or_404(ChecklistItem, item_id)
     db.session.delete(item)
     db.session.commit()
     return "", 204
@@ -815,7 +1246,7 @@ def api_delete_checklist_item(item_id):
 @app.post("/api/cards/<int:card_id>/attachments")
 def api_upload_attachment(card_id):
     app.logger.debug(f"POST /api/cards/{card_id}/attachments called")
-    card = Card.query.get_or_404(card_id)
+    card = db.get_or_404(Card, card_id)
     
     if 'file' not in request.files:
         return jsonify({"error": "No file provided"}), 400
@@ -830,7 +1261,6 @@ def api_upload_attachment(card_id):
         os.makedirs(upload_dir)
     
     # Generate unique filename
-    import uuid
     file_ext = os.path.splitext(file.filename)[1]
     filename = f"{uuid.uuid4()}{file_ext}"
     file_path = os.path.join(upload_dir, filename)
@@ -855,7 +1285,7 @@ def api_upload_attachment(card_id):
 @app.get("/api/attachments/<int:attachment_id>/download")
 def api_download_attachment(attachment_id):
     app.logger.debug(f"GET /api/attachments/{attachment_id}/download called")
-    attachment = Attachment.query.get_or_404(attachment_id)
+    attachment = db.get_or_404(Attachment, attachment_id)
     
     if not os.path.exists(attachment.file_path):
         return jsonify({"error": "File not found"}), 404
@@ -870,7 +1300,7 @@ def api_download_attachment(attachment_id):
 @app.delete("/api/attachments/<int:attachment_id>")
 def api_delete_attachment(attachment_id):
     app.logger.debug(f"DELETE /api/attachments/{attachment_id} called")
-    attachment = Attachment.query.get_or_404(attachment_id)
+    attachment = db.get_or_404(Attachment, attachment_id)
     
     # Delete file from disk
     if os.path.exists(attachment.file_path):
@@ -884,14 +1314,14 @@ def api_delete_attachment(attachment_id):
 @app.get("/api/boards/<int:board_id>/templates")
 def api_get_card_templates(board_id):
     app.logger.debug(f"GET /api/boards/{board_id}/templates called")
-    board = Board.query.get_or_404(board_id)
+    board = db.get_or_404(Board, board_id)
     templates = CardTemplate.query.filter_by(board_id=board_id).all()
     return jsonify([card_template_to_dict(template) for template in templates])
 
 @app.post("/api/boards/<int:board_id>/templates")
 def api_create_card_template(board_id):
     app.logger.debug(f"POST /api/boards/{board_id}/templates called")
-    board = Board.query.get_or_404(board_id)
+    board = db.get_or_404(Board, board_id)
     data = request.json or {}
     
     name = data.get("name", "New Template")
@@ -912,7 +1342,7 @@ def api_create_card_template(board_id):
 @app.delete("/api/templates/<int:template_id>")
 def api_delete_card_template(template_id):
     app.logger.debug(f"DELETE /api/templates/{template_id} called")
-    template = CardTemplate.query.get_or_404(template_id)
+    template = db.get_or_404(CardTemplate, template_id)
     db.session.delete(template)
     db.session.commit()
     return "", 204
@@ -920,7 +1350,7 @@ def api_delete_card_template(template_id):
 @app.post("/api/templates/<int:template_id>/create-card")
 def api_create_card_from_template(template_id):
     app.logger.debug(f"POST /api/templates/{template_id}/create-card called")
-    template = CardTemplate.query.get_or_404(template_id)
+    template = db.get_or_404(CardTemplate, template_id)
     data = request.json or {}
     
     column_id = data.get("column_id")
@@ -939,7 +1369,11 @@ def api_create_card_from_template(template_id):
         column_id=column_id
     )
     db.session.add(card)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"error": f"Column with id {column_id} not found"}), 404
     
     # Create checklists from template
     for checklist_data in template_data.get("checklists", []):
@@ -1178,6 +1612,10 @@ header h1 {
 .cards{flex:1;overflow-y:auto;display:flex;flex-direction:column;padding:.75rem;gap:.75rem}
 .card{background:var(--card-bg);border-radius:.5rem;padding:1rem;cursor:pointer; box-shadow: var(--shadow-sm); transition: box-shadow 0.2s ease-in-out;}
 .card:hover{box-shadow: var(--shadow-md);}
+/* Let the browser skip layout/paint for cards scrolled out of view; the
+   intrinsic size keeps the scrollbar stable until a card is first rendered */
+.card{content-visibility:auto;contain-intrinsic-size:auto 96px}
+.card.card-hidden{display:none}
 .card strong { display: block; margin-bottom: 0.25rem; font-weight: 600;}
 .card p {font-size:0.875rem; margin:0.25rem 0; color:var(--muted); line-height:1.4;}
 .card .meta { font-size: 0.75rem; color: var(--muted); margin-top: 0.5rem; display: flex; justify-content: space-between; flex-wrap: wrap; gap: 0.5rem;}
@@ -2218,6 +2656,32 @@ button.loading::after {
   gap: 0.5rem;
 }
 
+/* Undo toast for card deletes */
+.card.card-deleting {
+  display: none;
+}
+
+.undo-toast {
+  position: fixed;
+  bottom: 5rem;
+  left: 50%;
+  transform: translateX(-50%);
+  background: var(--surface);
+  color: var(--text);
+  border: 1px solid var(--border-color);
+  border-radius: 0.5rem;
+  padding: 0.5rem 0.75rem 0.5rem 1rem;
+  display: none;
+  align-items: center;
+  gap: 1rem;
+  box-shadow: var(--shadow-lg);
+  z-index: 101;
+}
+
+.undo-toast.visible {
+  display: flex;
+}
+
 /* Template Select Styles */
 .template-select {
   width: 100%;
@@ -2503,8 +2967,10 @@ button.loading::after {
 <script>
 //── Theme Toggle
 const themeToggleBtn = document.getElementById('themeToggle');
+let themeColors = null;  // Chart colors resolved from CSS variables; reset on theme change
 const applyTheme = (theme) => {
   document.documentElement.setAttribute('data-theme', theme);
+  themeColors = null;
   themeToggleBtn.textContent = theme === 'dark' ? '☀️' : '🌓';
   localStorage.setItem('theme', theme);
 };
@@ -2571,22 +3037,29 @@ const archivedCardsListEl = document.getElementById('archivedCardsList');
 // Shortcuts Modal (removed)
 // const shortcutsModalOverlay = document.getElementById('shortcutsModalOverlay');
 
-// Chart instances (no longer used)
-// let priorityPieChart = null;
-// let columnBarChart = null;
 
 //── Filter Listeners (with error handling)
-const setupFilterListener = (id, property) => {
+// Runs fn once input has been idle for `ms` (trailing edge only)
+const debounce = (fn, ms) => {
+  let timer;
+  return (...args) => {
+    clearTimeout(timer);
+    timer = setTimeout(() => fn(...args), ms);
+  };
+};
+const debouncedApplyFilters = debounce(applyFiltersUI, 120);
+
+const setupFilterListener = (id, property, debounced = false) => {
   const element = document.getElementById(id);
   if (element) {
     element.oninput = (e) => { 
       filterState[property] = property === 'q' ? e.target.value.toLowerCase() : e.target.value; 
-      applyFiltersUI(); 
+      debounced ? debouncedApplyFilters() : applyFiltersUI(); 
     };
   }
 };
 
-setupFilterListener('searchInput', 'q');
+setupFilterListener('searchInput', 'q', true);  // Typing: filter once per pause, not per key
 setupFilterListener('prioFilterSelect', 'prio');
 setupFilterListener('labelFilterSelect', 'label');
 setupFilterListener('startFromInput', 'from');
@@ -2650,99 +3123,145 @@ async function refreshBoardAndMetrics() {
     }
 }
 
+// Coalesce refresh requests: calls made while one is queued join it, and calls
+// made while one is in flight queue a single trailing refresh
+let refreshQueued = null;
+let refreshRunning = null;
+function scheduleRefresh() {
+    if (refreshQueued) return refreshQueued;
+    refreshQueued = (async () => {
+        await null;  // let other callers in the same task join this refresh
+        if (refreshRunning) await refreshRunning;
+        refreshQueued = null;
+        const run = refreshRunning = refreshBoardAndMetrics();
+        await run;
+        if (refreshRunning === run) refreshRunning = null;
+    })();
+    return refreshQueued;
+}
+
+async function refreshMetrics() {
+    try {
+        const metricsData = await apiFetch(currentBoardId ? `/api/metrics/${currentBoardId}` : '/api/metrics');
+        if (metricsData) renderDashboardUI(metricsData);
+    } catch (err) {
+        console.error("Metrics refresh failed:", err);
+    }
+}
+
 //── Dashboard Rendering 
+let currentMetrics = null;
+
+// One style resolution per theme instead of one per color per render
+function getThemeColors() {
+    if (themeColors) return themeColors;
+    const styles = getComputedStyle(document.documentElement);
+    const color = (name, fallback) => styles.getPropertyValue(name).trim() || fallback;
+    themeColors = {
+        textColor: color('--text', '#111827'),
+        surfaceColor: color('--surface', '#ffffff'),
+        gridColor: color('--border-color', '#e5e7eb'),
+        highColor: color('--high', '#ef4444'),
+        medColor: color('--med', '#f59e0b'),
+        lowColor: color('--low', '#10b981'),
+        barColor: color('--button-primary-bg', '#2563eb'),
+    };
+    return themeColors;
+}
+
+// The stat tiles and chart canvases are built once; later renders only swap
+// the numbers and update the existing Chart instances in place.
+let dashStatsEl = null;
+let priorityCanvasEl = null;
+let columnCanvasEl = null;
+let priorityChart = null;
+let columnChart = null;
+
+function ensureDashboardLayout() {
+    if (dashStatsEl?.isConnected) return;
+    if (priorityChart) { priorityChart.destroy(); priorityChart = null; }
+    if (columnChart) { columnChart.destroy(); columnChart = null; }
+    
+    dashboardAreaEl.innerHTML = `
+        <div class="dash-stats" style="display: contents;">
+            <div class="dash-stat urgent">
+                <div class="dash-stat-value" data-stat="overdue">0</div>
+                <div class="dash-stat-label">Overdue</div>
+            </div>
+            <div class="dash-stat warning">
+                <div class="dash-stat-value" data-stat="today">0</div>
+                <div class="dash-stat-label">Due Today</div>
+            </div>
+            <div class="dash-stat">
+                <div class="dash-stat-value" data-stat="week">0</div>
+                <div class="dash-stat-label">Due This Week</div>
+            </div>
+            <div class="dash-separator"></div>
+            <div class="dash-stat">
+                <div class="dash-stat-value" data-stat="active">0</div>
+                <div class="dash-stat-label">Active</div>
+            </div>
+            <div class="dash-stat success">
+                <div class="dash-stat-value" data-stat="done">0</div>
+                <div class="dash-stat-label">Done</div>
+            </div>
+        </div>
+        <div style="display: flex; gap: 20px; margin-top: 15px; height: 180px;">
+            <div style="flex: 1; position: relative;"><canvas></canvas></div>
+            <div style="flex: 1; position: relative;"><canvas></canvas></div>
+        </div>
+    `;
+    dashStatsEl = dashboardAreaEl.querySelector('.dash-stats');
+    [priorityCanvasEl, columnCanvasEl] = dashboardAreaEl.querySelectorAll('canvas');
+}
+
 function renderDashboardUI(metrics) {
     if (!dashboardAreaEl) return;
+    currentMetrics = metrics;
     if (!metrics) {
         dashboardAreaEl.innerHTML = '<div>No metrics available</div>';
         return;
     }
+    ensureDashboardLayout();
+    
+    const stats = {
+        overdue: metrics.due_date_insights?.total_overdue,
+        today: metrics.due_date_insights?.due_today,
+        week: metrics.due_date_insights?.due_next_7_days,
+        active: metrics.overall_stats?.active_cards,
+        done: metrics.overall_stats?.completed_cards,
+    };
+    dashStatsEl.querySelectorAll('[data-stat]').forEach(el => {
+        el.textContent = stats[el.dataset.stat] || 0;
+    });
     
-    // Destroy existing charts
-    if (window.priorityChart) {
-        window.priorityChart.destroy();
-        window.priorityChart = null;
-    }
-    if (window.columnChart) {
-        window.columnChart.destroy();
-        window.columnChart = null;
-    }
-    
-    // Simple stats
-    dashboardAreaEl.innerHTML = `
-        <div class="dash-stat urgent">
-            <div class="dash-stat-value">${metrics.due_date_insights?.total_overdue || 0}</div>
-            <div class="dash-stat-label">Overdue</div>
-        </div>
-        <div class="dash-stat warning">
-            <div class="dash-stat-value">${metrics.due_date_insights?.due_today || 0}</div>
-            <div class="dash-stat-label">Due Today</div>
-        </div>
-        <div class="dash-stat">
-            <div class="dash-stat-value">${metrics.due_date_insights?.due_next_7_days || 0}</div>
-            <div class="dash-stat-label">Due This Week</div>
-        </div>
-        <div class="dash-separator"></div>
-        <div class="dash-stat">
-            <div class="dash-stat-value">${metrics.overall_stats?.active_cards || 0}</div>
-            <div class="dash-stat-label">Active</div>
-        </div>
-        <div class="dash-stat success">
-            <div class="dash-stat-value">${metrics.overall_stats?.completed_cards || 0}</div>
-            <div class="dash-stat-label">Done</div>
-        </div>
-    `;
-    
-    // Add charts
-    const chartContainer = document.createElement('div');
-    chartContainer.style.cssText = `
-        display: flex;
-        gap: 20px;
-        margin-top: 15px;
-        height: 180px;
-    `;
+    // Colors are re-applied on every update so a theme switch shows up on the next render
+    const { textColor, surfaceColor, gridColor, highColor, medColor, lowColor, barColor } = getThemeColors();
     
-    // Priority chart
-    const priorityDiv = document.createElement('div');
-    priorityDiv.style.cssText = 'flex: 1; position: relative;';
-    const priorityCanvas = document.createElement('canvas');
-    priorityDiv.appendChild(priorityCanvas);
-    chartContainer.appendChild(priorityDiv);
-    
-    // Column chart
-    const columnDiv = document.createElement('div');
-    columnDiv.style.cssText = 'flex: 1; position: relative;';
-    const columnCanvas = document.createElement('canvas');
-    columnDiv.appendChild(columnCanvas);
-    chartContainer.appendChild(columnDiv);
-    
-    dashboardAreaEl.appendChild(chartContainer);
-    
-    // Create charts with theme-aware colors
-    setTimeout(() => {
-        const textColor = getComputedStyle(document.documentElement).getPropertyValue('--text') || '#111827';
-        const surfaceColor = getComputedStyle(document.documentElement).getPropertyValue('--surface') || '#ffffff';
-        const gridColor = getComputedStyle(document.documentElement).getPropertyValue('--border-color') || '#e5e7eb';
-        
-        if (metrics.priority_insights?.labels && metrics.priority_insights?.counts) {
-            window.priorityChart = new Chart(priorityCanvas, {
+    if (metrics.priority_insights?.labels && metrics.priority_insights?.counts) {
+        const dataset = {
+            data: metrics.priority_insights.counts,
+            backgroundColor: [highColor, medColor, lowColor],
+            borderColor: surfaceColor,
+            borderWidth: 2
+        };
+        if (priorityChart) {
+            priorityChart.data.labels = metrics.priority_insights.labels;
+            Object.assign(priorityChart.data.datasets[0], dataset);
+            priorityChart.options.plugins.legend.labels.color = textColor;
+            priorityChart.update('none');
+        } else {
+            priorityChart = new Chart(priorityCanvasEl, {
                 type: 'pie',
                 data: {
                     labels: metrics.priority_insights.labels,
-                    datasets: [{
-                        data: metrics.priority_insights.counts,
-                        backgroundColor: [
-                            getComputedStyle(document.documentElement).getPropertyValue('--high') || '#ef4444',
-                            getComputedStyle(document.documentElement).getPropertyValue('--med') || '#f59e0b',
-                            getComputedStyle(document.documentElement).getPropertyValue('--low') || '#10b981'
-                        ],
-                        borderColor: surfaceColor,
-                        borderWidth: 2
-                    }]
+                    datasets: [dataset]
                 },
                 options: {
                     responsive: true,
                     maintainAspectRatio: false,
+                    animation: false,
+                    parsing: false,  // Counts are already plain numbers, the pie's internal format
                     plugins: {
                         legend: { 
                             position: 'bottom',
@@ -2755,22 +3274,34 @@ function renderDashboardUI(metrics) {
                 }
             });
         }
-        
-        if (metrics.column_breakdown?.length) {
-            window.columnChart = new Chart(columnCanvas, {
+    }
+    
+    if (metrics.column_breakdown?.length) {
+        const dataset = {
+            data: metrics.column_breakdown.map(col => col.card_count),
+            backgroundColor: barColor,
+            borderColor: barColor,
+            borderWidth: 1
+        };
+        if (columnChart) {
+            columnChart.data.labels = metrics.column_breakdown.map(col => col.name);
+            Object.assign(columnChart.data.datasets[0], dataset);
+            const { x, y } = columnChart.options.scales;
+            x.ticks.color = y.ticks.color = textColor;
+            x.grid.color = gridColor;
+            columnChart.update('none');
+        } else {
+            columnChart = new Chart(columnCanvasEl, {
                 type: 'bar',
                 data: {
                     labels: metrics.column_breakdown.map(col => col.name),
-                    datasets: [{
-                        data: metrics.column_breakdown.map(col => col.card_count),
-                        backgroundColor: getComputedStyle(document.documentElement).getPropertyValue('--button-primary-bg') || '#2563eb',
-                        borderColor: getComputedStyle(document.documentElement).getPropertyValue('--button-primary-bg') || '#2563eb',
-                        borderWidth: 1
-                    }]
+                    datasets: [dataset]
                 },
                 options: {
                     responsive: true,
                     maintainAspectRatio: false,
+                    animation: false,
+                    normalized: true,
                     indexAxis: 'y',
                     plugins: {
                         legend: { display: false }
@@ -2795,7 +3326,37 @@ function renderDashboardUI(metrics) {
                 }
             });
         }
-    }, 50);
+    }
+}
+
+// A card moving between columns only changes the per-column and active/done
+// counts, so adjust the last metrics locally instead of refetching them.
+// Mirrors the server: "Done" is the first column titled done, else the last.
+function applyCardMoveToMetrics(fromColumnId, toColumnId) {
+    const columns = currentBoardData?.columns;
+    const breakdown = currentMetrics?.column_breakdown;
+    if (!columns || !breakdown || breakdown.length !== columns.length) return false;
+    const fromIndex = columns.findIndex(col => col.id === fromColumnId);
+    const toIndex = columns.findIndex(col => col.id === toColumnId);
+    if (fromIndex === -1 || toIndex === -1) return false;
+    
+    const total = currentMetrics.overall_stats.total_cards;
+    const updated = breakdown.map(col => ({ ...col }));
+    updated[fromIndex].card_count -= 1;
+    updated[toIndex].card_count += 1;
+    updated.forEach(col => {
+        col.percentage_of_total = total ? Math.round(col.card_count / total * 1000) / 10 : 0;
+    });
+    let doneIndex = columns.findIndex(col => col.title.toLowerCase() === 'done');
+    if (doneIndex === -1) doneIndex = columns.length - 1;
+    const completed = updated[doneIndex].card_count;
+    
+    renderDashboardUI({
+        ...currentMetrics,
+        overall_stats: { ...currentMetrics.overall_stats, active_cards: total - completed, completed_cards: completed },
+        column_breakdown: updated
+    });
+    return true;
 }
 
 function formatLabel(key) {
@@ -2804,6 +3365,76 @@ function formatLabel(key) {
 
 
 //── Board Rendering
+// Rendered nodes by id, so re-renders can reuse them instead of rebuilding the board
+const columnNodes = new Map();
+const cardNodes = new Map();
+
+// Make container's children exactly `nodes`, in order, touching only what differs.
+// Runs of nodes to insert are gathered in a fragment and inserted in one go.
+function syncChildren(container, nodes) {
+    let ref = container.firstChild;
+    let pending = null;
+    const flush = () => {
+        if (pending) container.insertBefore(pending, ref);
+        pending = null;
+    };
+    for (const node of nodes) {
+        if (node === ref) {
+            flush();
+            ref = ref.nextSibling;
+            continue;
+        }
+        (pending ||= document.createDocumentFragment()).appendChild(node);
+    }
+    flush();
+    while (ref) {
+        const next = ref.nextSibling;
+        ref.remove();
+        ref = next;
+    }
+}
+
+// Existing node for the card if its content is unchanged, else a fresh one.
+// Position and column are left out of the comparison: moves don't need a rebuild.
+function cardNode(card) {
+    const { position, column_id, ...content } = card;
+    const signature = JSON.stringify(content);
+    let cardEl = cardNodes.get(card.id);
+    if (!cardEl || cardEl._signature !== signature) {
+        cardEl = createCardElement(card);
+        cardEl._signature = signature;
+        cardNodes.set(card.id, cardEl);
+    }
+    cardEl._card = card;
+    return cardEl;
+}
+
+// Card data by id from the rendered board; fetches the board only when the card
+// isn't on screen or fresh server data is needed
+async function getCard(cardId, refetch = false) {
+    const cardEl = refetch ? null : cardNodes.get(Number(cardId));
+    if (cardEl) return cardEl._card;
+    const boardData = await apiFetch(`/api/board/${currentBoardId}`);
+    return boardData.columns.flatMap(col => col.cards).find(c => c.id == cardId) || null;
+}
+
+// One pair of delegated listeners serves every card and add button on the board
+boardContainerEl?.addEventListener('click', (e) => {
+    const addBtn = e.target.closest('.add-card-btn');
+    if (addBtn) {
+        openCardModal(null, addBtn.dataset.columnId);
+        return;
+    }
+    const cardEl = e.target.closest('.card');
+    if (cardEl?._card && !e.target.closest('button')) openCardModal(cardEl._card);
+});
+boardContainerEl?.addEventListener('contextmenu', (e) => {
+    const cardEl = e.target.closest('.card');
+    if (!cardEl?._card) return;
+    e.preventDefault();
+    deleteCardWithUndo(cardEl);
+});
+
 function renderBoardUI(boardData) {
     if (!boardContainerEl) {
         console.error("Board container element not found");
@@ -2812,43 +3443,44 @@ function renderBoardUI(boardData) {
     if (!boardData || !boardData.columns || !Array.isArray(boardData.columns)) {
         console.error("No board data or columns provided");
         boardContainerEl.innerHTML = '<div style="text-align: center; padding: 2rem; color: var(--error-color);">Invalid board data</div>';
+        columnNodes.clear();
+        cardNodes.clear();
         return;
     }
-    boardContainerEl.innerHTML = ''; 
+    // Reconcile against the nodes already on screen: unchanged columns and
+    // cards are reused (and only moved if their order changed)
+    const seenColumns = new Set();
+    const seenCards = new Set();
+    const columnEls = [];
     boardData.columns.forEach(column => {
         if (!column || !column.id) {
             console.warn("Invalid column data:", column);
             return;
         }
-        
-        const columnEl = document.createElement('div');
-        columnEl.className = 'column';
-        columnEl.dataset.id = column.id;
-        columnEl.innerHTML = `
-            <div class='column-header'>
-                <span>${column.title}</span>
-                <button class='add-card-btn' data-column-id='${column.id}' title="Add new card">＋</button>
-            </div>
-            <div class='cards'></div>`;
-        boardContainerEl.appendChild(columnEl);
-        
-        const cardsContainerEl = columnEl.querySelector('.cards');
-        if (column.cards && Array.isArray(column.cards)) {
-            column.cards.forEach(card => {
-                if (card && card.id) {
-                    cardsContainerEl.appendChild(createCardElement(card));
-                } else {
-                    console.warn("Invalid card data:", card);
-                }
-            });
-        }
-        
-        initializeSortable(cardsContainerEl);
-        const addCardBtn = columnEl.querySelector('.add-card-btn');
-        if (addCardBtn) {
-            addCardBtn.onclick = (e) => openCardModal(null, e.target.dataset.columnId);
+        seenColumns.add(column.id);
+        let columnEl = columnNodes.get(column.id);
+        if (!columnEl || columnEl._title !== column.title) {
+            columnEl = createColumnElement({ ...column, cards: [] });
         }
+        const cardEls = [];
+        (Array.isArray(column.cards) ? column.cards : []).forEach(card => {
+            if (card && card.id) {
+                seenCards.add(card.id);
+                cardEls.push(cardNode(card));
+            } else {
+                console.warn("Invalid card data:", card);
+            }
+        });
+        const cardsContainerEl = columnEl.querySelector('.cards');
+        cardsContainerEl._cardEls = cardEls;  // Board order, for applyFiltersUI()
+        syncChildren(cardsContainerEl, cardEls);
+        columnEls.push(columnEl);
     });
+    for (const id of columnNodes.keys()) if (!seenColumns.has(id)) columnNodes.delete(id);
+    for (const id of cardNodes.keys()) if (!seenCards.has(id)) cardNodes.delete(id);
+
+    const nav = boardContainerEl.querySelector('.column-nav');
+    syncChildren(boardContainerEl, nav ? [nav, ...columnEls] : columnEls);
     
     // Re-add column navigation and update small mode if active
     const existingNav = boardContainerEl.querySelector('.column-nav');
@@ -2871,6 +3503,41 @@ function renderBoardUI(boardData) {
     }
 }
 
+function createColumnElement(column) {
+    const columnEl = document.createElement('div');
+    columnEl.className = 'column';
+    columnEl.dataset.id = column.id;
+    columnEl.innerHTML = `
+        <div class='column-header'>
+            <span>${column.title}</span>
+            <button class='add-card-btn' data-column-id='${column.id}' title="Add new card">＋</button>
+        </div>
+        <div class='cards'></div>`;
+    
+    columnEl._title = column.title;
+    columnNodes.set(column.id, columnEl);
+    
+    const cardsContainerEl = columnEl.querySelector('.cards');
+    cardsContainerEl._cardEls = [];
+    if (column.cards && Array.isArray(column.cards)) {
+        column.cards.forEach(card => {
+            if (card && card.id) {
+                const cardEl = cardNode(card);
+                cardsContainerEl._cardEls.push(cardEl);
+                cardsContainerEl.appendChild(cardEl);
+            } else {
+                console.warn("Invalid card data:", card);
+            }
+        });
+    }
+    
+    observeSortable(cardsContainerEl);
+    return columnEl;
+}
+
+const CARD_TEMPLATE = document.createElement('template');
+CARD_TEMPLATE.innerHTML = '<strong></strong><p></p><div class="card-labels"></div><div class="meta"><span></span><span></span></div>';
+
 function createCardElement(card) {
     if (!card || !card.id || !card.title) {
         console.error("Invalid card data:", card);
@@ -2885,30 +3552,44 @@ function createCardElement(card) {
     cardEl.dataset.due = card.due_date || '';
     cardEl.dataset.labels = card.labels && Array.isArray(card.labels) ? card.labels.map(l => l.id).join(',') : '';
 
-    let cardHTML = `<strong>${card.title}</strong>`;
+    // Clone the prebuilt markup and fill it with textContent: no HTML parsing per
+    // card, and titles/descriptions can't inject markup
+    cardEl.appendChild(CARD_TEMPLATE.content.cloneNode(true));
+    cardEl.querySelector('strong').textContent = card.title;
+    const descEl = cardEl.querySelector('p');
     if (card.description) {
-        cardHTML += `<p>${card.description.substring(0, 100) + (card.description.length > 100 ? '...' : '')}</p>`;
+        descEl.textContent = card.description.substring(0, 100) + (card.description.length > 100 ? '...' : '');
+    } else {
+        descEl.remove();
     }
     
     // Add labels
+    const labelsEl = cardEl.querySelector('.card-labels');
     if (card.labels && card.labels.length > 0) {
-        cardHTML += `<div class="card-labels">
-            ${card.labels.map(label => 
-                `<span class="label" style="background-color: ${label.color}">${label.name}</span>`
-            ).join('')}
-        </div>`;
+        card.labels.forEach(label => {
+            const labelEl = document.createElement('span');
+            labelEl.className = 'label';
+            labelEl.style.backgroundColor = label.color;
+            labelEl.textContent = label.name;
+            labelsEl.appendChild(labelEl);
+        });
+    } else {
+        labelsEl.remove();
     }
     
-    cardHTML += `<div class="meta">
-                    <span>Priority: ${PRIORITY_MAP_DISPLAY[card.priority] || 'N/A'}</span>`;
+    const [prioEl, dueEl] = cardEl.querySelectorAll('.meta span');
+    prioEl.textContent = `Priority: ${PRIORITY_MAP_DISPLAY[card.priority] || 'N/A'}`;
     if (card.due_date) {
-        cardHTML += `<span>Due: ${card.due_date}</span>`;
+        dueEl.textContent = `Due: ${card.due_date}`;
+    } else {
+        dueEl.remove();
     }
-    cardHTML += `</div>`;
-    cardEl.innerHTML = cardHTML;
+    cardEl._searchText = cardEl.textContent.toLowerCase();  // Read once while detached; filters reuse it
+    // Dates as epoch numbers for the range filters; a missing date never matches a bound
+    cardEl._startTs = card.start_date ? Date.parse(card.start_date) : -Infinity;
+    cardEl._dueTs = card.due_date ? Date.parse(card.due_date) : Infinity;
 
-    cardEl.onclick = (e) => { if (!e.target.closest('button')) openCardModal(card); };
-    cardEl.oncontextmenu = (e) => { e.preventDefault(); if (confirm('Delete card?')) deleteCardAPI(card.id); };
+    cardEl._card = card;
     return cardEl;
 }
 
@@ -3024,7 +3705,7 @@ cardModalForm.onsubmit = async (e) => {
         const method = cardId ? 'PATCH' : 'POST';
         await apiFetch(url, { method, headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(cardData) });
         closeCardModal();
-        refreshBoardAndMetrics();
+        scheduleRefresh();
     } catch (err) { 
         console.error("Failed to save card:", err);
         alert("Failed to save card. Please try again.");
@@ -3034,12 +3715,76 @@ cardModalForm.onsubmit = async (e) => {
 //── Card Actions API
 async function deleteCardAPI(cardId) {
     try {
-        await apiFetch(`/api/card/${cardId}`, { method: 'DELETE' });
-        refreshBoardAndMetrics();
+        // keepalive lets a delete committed on page exit still reach the server
+        await apiFetch(`/api/card/${cardId}`, { method: 'DELETE', keepalive: true });
+        scheduleRefresh();
     } catch (err) { console.error("Failed to delete card:", err); }
 }
 
+//── Undoable Card Delete
+// The card is hidden straight away and the DELETE is only sent once the undo
+// window closes; Undo (or z) inside the window puts it back.
+let pendingCardDelete = null;
+const undoToastEl = document.createElement('div');
+undoToastEl.className = 'undo-toast';
+undoToastEl.innerHTML = '<span></span><button type="button" class="btn-secondary btn-sm">Undo</button>';
+undoToastEl.querySelector('button').onclick = () => undoCardDelete();
+document.body.appendChild(undoToastEl);
+
+function deleteCardWithUndo(cardEl, undoMs = 4000) {
+    commitCardDelete();  // Only one delete is pending at a time
+    cardEl.classList.add('card-deleting');
+    pendingCardDelete = { cardEl, timer: setTimeout(commitCardDelete, undoMs) };
+    undoToastEl.querySelector('span').textContent = `Deleted "${cardEl._card.title}"`;
+    undoToastEl.classList.add('visible');
+}
+
+function takePendingCardDelete() {
+    const pending = pendingCardDelete;
+    if (pending) {
+        pendingCardDelete = null;
+        clearTimeout(pending.timer);
+        undoToastEl.classList.remove('visible');
+    }
+    return pending;
+}
+
+function commitCardDelete() {
+    const pending = takePendingCardDelete();
+    if (pending) deleteCardAPI(pending.cardEl._card.id);
+}
+
+function undoCardDelete() {
+    const pending = takePendingCardDelete();
+    if (pending) pending.cardEl.classList.remove('card-deleting');
+}
+
+window.addEventListener('pagehide', commitCardDelete);
+
 //── Drag‑and‑Drop
+// Full card order of a column from the last board payload, so cards hidden by
+// filters keep their slots when a column is renumbered.
+function columnCardIds(columnId) {
+    const column = currentBoardData?.columns?.find(col => col.id === columnId);
+    return column?.cards ? column.cards.map(card => card.id) : [];
+}
+
+// Sortable is only set up on a column's card list once it first comes into view
+const sortableObserver = 'IntersectionObserver' in window
+    ? new IntersectionObserver((entries) => {
+        entries.forEach(entry => {
+            if (!entry.isIntersecting) return;
+            sortableObserver.unobserve(entry.target);
+            initializeSortable(entry.target);
+        });
+    }, { rootMargin: '200px' })
+    : null;
+
+function observeSortable(cardsContainerEl) {
+    if (sortableObserver) sortableObserver.observe(cardsContainerEl);
+    else initializeSortable(cardsContainerEl);
+}
+
 function initializeSortable(cardsContainerEl) {
     new Sortable(cardsContainerEl, {
         group: 'kanban-cards',
@@ -3048,50 +3793,88 @@ function initializeSortable(cardsContainerEl) {
         chosenClass: 'sortable-chosen',
         dragClass: 'sortable-drag',
         onEnd: async (evt) => {
-            const cardId = evt.item.dataset.id;
-            const newColumnId = evt.to.closest('.column').dataset.id;
-            const newPosition = evt.newDraggableIndex;
+            const cardId = parseInt(evt.item.dataset.id);
+            const fromColumnId = parseInt(evt.from.closest('.column').dataset.id);
+            const toColumnId = parseInt(evt.to.closest('.column').dataset.id);
+            if (fromColumnId === toColumnId && evt.oldIndex === evt.newIndex) return;
+
+            // Insert the card before the next visible card in the target column's full order
+            const sourceIds = columnCardIds(fromColumnId).filter(id => id !== cardId);
+            const targetIds = fromColumnId === toColumnId
+                ? sourceIds
+                : columnCardIds(toColumnId).filter(id => id !== cardId);
+            let nextEl = evt.item.nextElementSibling;
+            while (nextEl && (!nextEl.classList.contains('card') || nextEl.classList.contains('card-hidden'))) {
+                nextEl = nextEl.nextElementSibling;
+            }
+            const nextIndex = nextEl ? targetIds.indexOf(parseInt(nextEl.dataset.id)) : -1;
+            targetIds.splice(nextIndex === -1 ? targetIds.length : nextIndex, 0, cardId);
+
+            // Renumber every affected column and save it in one request
+            const moves = targetIds.map((id, position) => ({ id, column_id: toColumnId, position }));
+            if (fromColumnId !== toColumnId) {
+                sourceIds.forEach((id, position) => moves.push({ id, column_id: fromColumnId, position }));
+            }
             
             try {
-                await apiFetch(`/api/card/${cardId}`, {
-                    method: 'PATCH',
+                const boardData = await apiFetch('/api/reorder', {
+                    method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ column_id: parseInt(newColumnId), position: newPosition })
+                    body: JSON.stringify(moves)
                 });
-                refreshBoardAndMetrics(); 
+                currentBoardData = boardData;
+                renderBoardUI(boardData);
+                applyFiltersUI();
+                if (fromColumnId !== toColumnId && !applyCardMoveToMetrics(fromColumnId, toColumnId)) {
+                    refreshMetrics();
+                }
             } catch (err) {
                 console.error("Failed to update card position:", err);
-                refreshBoardAndMetrics();
+                scheduleRefresh();
             }
         }
     });
 }
 
 //── Filter Application with Sorting and Grouping
+// Predicate for the current filterState holding only the active checks, so
+// the per-card loop never re-tests filters that are switched off
+function buildCardFilter() {
+    const { q, prio, from, to, label } = filterState;
+    const checks = [];
+    if (q) checks.push(cardEl => cardEl._searchText.includes(q));
+    if (prio) checks.push(cardEl => cardEl.dataset.prio === prio);
+    if (from) {
+        const fromTs = Date.parse(from);
+        checks.push(cardEl => cardEl._startTs >= fromTs);
+    }
+    if (to) {
+        const toTs = Date.parse(to);
+        checks.push(cardEl => cardEl._dueTs <= toTs);
+    }
+    if (label) checks.push(cardEl => !!cardEl.dataset.labels && cardEl.dataset.labels.includes(label));
+    if (checks.length === 0) return () => true;
+    if (checks.length === 1) return checks[0];
+    return cardEl => checks.every(check => check(cardEl));
+}
+
 function applyFiltersUI() {
-    const columns = document.querySelectorAll('.column');
-    
-    columns.forEach(column => {
-        const cardsContainer = column.querySelector('.cards');
+    const cardMatchesFilters = buildCardFilter();
+    columnNodes.forEach(columnEl => {
+        const cardsContainer = columnEl.querySelector('.cards');
         if (!cardsContainer) return;
         
-        const cards = Array.from(cardsContainer.querySelectorAll('.card'));
-        
-        // Filter cards
-        const filteredCards = cards.filter(cardElement => {
-            const titleDescContent = cardElement.textContent || ""; 
-            const qOk = !filterState.q || titleDescContent.toLowerCase().includes(filterState.q);
-            const pOk = !filterState.prio || cardElement.dataset.prio === filterState.prio;
-            const sOk = !filterState.from || (cardElement.dataset.start && cardElement.dataset.start >= filterState.from);
-            const dOk = !filterState.to || (cardElement.dataset.due && cardElement.dataset.due <= filterState.to);
-            const lOk = !filterState.label || (cardElement.dataset.labels && cardElement.dataset.labels.includes(filterState.label));
-            
-            return qOk && pOk && sOk && dOk && lOk;
+        // Decide everything from cached card data first (no DOM reads), starting
+        // from the board order so an earlier sort or filter never sticks
+        const visible = [];
+        const hidden = [];
+        (cardsContainer._cardEls || []).forEach(cardEl => {
+            (cardMatchesFilters(cardEl) ? visible : hidden).push(cardEl);
         });
         
         // Sort filtered cards if sorting is enabled
         if (filterState.sort) {
-            filteredCards.sort((a, b) => {
+            visible.sort((a, b) => {
                 switch (filterState.sort) {
                     case 'priority':
                         return parseInt(a.dataset.prio) - parseInt(b.dataset.prio);
@@ -3104,9 +3887,7 @@ function applyFiltersUI() {
                         const bStart = b.dataset.start || '9999-12-31';
                         return aStart.localeCompare(bStart);
                     case 'title':
-                        const aTitle = a.querySelector('strong')?.textContent || '';
-                        const bTitle = b.querySelector('strong')?.textContent || '';
-                        return aTitle.localeCompare(bTitle);
+                        return (a._card?.title || '').localeCompare(b._card?.title || '');
                     case 'created':
                         return parseInt(a.dataset.id) - parseInt(b.dataset.id);
                     default:
@@ -3115,22 +3896,17 @@ function applyFiltersUI() {
             });
         }
         
-        // Clear the container
-        cardsContainer.innerHTML = '';
-        
-        // Group cards if grouping is enabled
-        if (filterState.groupBy) {
-            displayGroupedCards(cardsContainer, filteredCards);
-        } else {
-            // Display cards normally
-            filteredCards.forEach(card => {
-                cardsContainer.appendChild(card);
-            });
-        }
+        // Then write: toggle visibility and move only the nodes that are out of
+        // place. Hidden cards stay in the DOM, after the visible ones.
+        visible.forEach(cardEl => cardEl.classList.remove('card-hidden'));
+        hidden.forEach(cardEl => cardEl.classList.add('card-hidden'));
+        const ordered = filterState.groupBy ? groupedCardNodes(visible) : visible;
+        syncChildren(cardsContainer, ordered.concat(hidden));
     });
 }
 
-function displayGroupedCards(container, cards) {
+// Visible cards interleaved with a header node per group
+function groupedCardNodes(cards) {
     const groups = {};
     
     // Group cards
@@ -3179,16 +3955,14 @@ function displayGroupedCards(container, cards) {
     });
     
     // Display grouped cards
+    const nodes = [];
     Object.entries(groups).forEach(([groupName, groupCards]) => {
         const groupHeader = document.createElement('div');
         groupHeader.className = 'group-header';
         groupHeader.innerHTML = `<strong>${groupName} (${groupCards.length})</strong>`;
-        container.appendChild(groupHeader);
-        
-        groupCards.forEach(card => {
-            container.appendChild(card);
-        });
+        nodes.push(groupHeader, ...groupCards);
     });
+    return nodes;
 }
 
 //── Add Column
@@ -3236,6 +4010,7 @@ async function switchBoard(boardId) {
         ]);
         
         await loadLabels();
+        currentBoardData = boardData;
         renderBoardUI(boardData);
         renderDashboardUI(metricsData);
         applyFiltersUI();
@@ -3289,7 +4064,7 @@ async function archiveCard(cardId) {
     try {
         await apiFetch(`/api/cards/${cardId}/archive`, { method: 'POST' });
         cardModalOverlayEl.style.display = 'none';
-        await refreshBoardAndMetrics();
+        await scheduleRefresh();
     } catch (err) {
         console.error("Failed to archive card:", err);
     }
@@ -3299,7 +4074,7 @@ async function unarchiveCard(cardId) {
     try {
         await apiFetch(`/api/cards/${cardId}/unarchive`, { method: 'POST' });
         await showArchivedCards();
-        await refreshBoardAndMetrics();
+        await scheduleRefresh();
     } catch (err) {
         console.error("Failed to unarchive card:", err);
     }
@@ -3455,6 +4230,10 @@ document.addEventListener('keydown', (e) => {
                 modal.style.display = 'none';
             });
             break;
+        case 'z':
+        case 'Z':
+            undoCardDelete();
+            break;
     }
 });
 
@@ -3586,10 +4365,9 @@ async function deleteChecklistItem(itemId) {
 // Attachment Management
 let currentCardAttachments = [];
 
-async function loadCardAttachments(cardId) {
+async function loadCardAttachments(cardId, refetch = false) {
     try {
-        const card = await apiFetch(`/api/board/${currentBoardId}`);
-        const cardData = card.columns.flatMap(col => col.cards).find(c => c.id == cardId);
+        const cardData = await getCard(cardId, refetch);
         currentCardAttachments = cardData ? cardData.attachments || [] : [];
         renderAttachments();
     } catch (err) {
@@ -3653,7 +4431,7 @@ async function uploadAttachment(files) {
         }
     }
     
-    await loadCardAttachments(cardId);
+    await loadCardAttachments(cardId, true);
 }
 
 function downloadAttachment(attachmentId) {
@@ -3666,7 +4444,7 @@ async function deleteAttachment(attachmentId) {
     try {
         await apiFetch(`/api/attachments/${attachmentId}`, { method: 'DELETE' });
         const cardId = cardModalIdField.value;
-        await loadCardAttachments(cardId);
+        await loadCardAttachments(cardId, true);
     } catch (err) {
         console.error("Failed to delete attachment:", err);
     }
@@ -3790,8 +4568,7 @@ document.getElementById('templateForm').onsubmit = async (e) => {
     
     try {
         // Get current card data
-        const card = await apiFetch(`/api/board/${currentBoardId}`);
-        const cardData = card.columns.flatMap(col => col.cards).find(c => c.id == cardId);
+        const cardData = await getCard(cardId);
         
         const templateData = {
             title: cardData.title,
@@ -3867,16 +4644,25 @@ document.getElementById('columnModalForm').onsubmit = async (e) => {
     if (!title) return;
     
     try {
-        await apiFetch('/api/column', { 
+        const column = await apiFetch('/api/column', { 
             method: 'POST', 
             headers: { 'Content-Type': 'application/json' }, 
             body: JSON.stringify({ title, board_id: currentBoardId }) 
         });
-        refreshBoardAndMetrics();
+        // The new column comes back in full; append it instead of reloading the board
+        if (currentBoardData && boardContainerEl) {
+            currentBoardData.columns.push(column);
+            boardContainerEl.appendChild(createColumnElement(column));
+            if (isSmallMode) updateColumnDisplay();
+            refreshMetrics();
+        } else {
+            scheduleRefresh();
+        }
         document.getElementById('columnModalOverlay').style.display = 'none';
         document.getElementById('columnTitleField').value = '';
     } catch (err) {
         console.error("Failed to add column:", err);
+        scheduleRefresh();
     }
 };
 
@@ -4013,12 +4799,9 @@ function openCardById(cardId) {
         return;
     }
     
-    fetch(`/api/board/${currentBoardId}`)
-        .then(res => res.json())
-        .then(boardData => {
-            const card = boardData.columns.flatMap(col => col.cards).find(c => c.id == cardId);
-            if (card) openCardModal(card);
-        });
+    getCard(cardId)
+        .then(card => { if (card) openCardModal(card); })
+        .catch(err => console.error("Failed to open card:", err));
 }
 
 // Phase 3: Quick Add Cards
@@ -4104,7 +4887,7 @@ async function createQuickCard(columnId, text) {
                 due_date: dueDate
             })
         });
-        refreshBoardAndMetrics();
+        scheduleRefresh();
     } catch (err) {
         console.error("Failed to create quick card:", err);
     }
@@ -4240,7 +5023,7 @@ async function executeBulkMove() {
     }
     
     toggleBulkSelectMode();
-    refreshBoardAndMetrics();
+    scheduleRefresh();
 }
 
 async function bulkArchiveCards() {
@@ -4272,7 +5055,7 @@ async function bulkArchiveCards() {
     }
     
     toggleBulkSelectMode();
-    refreshBoardAndMetrics();
+    scheduleRefresh();
 }
 
 // Template selection handler
@@ -4487,19 +5270,51 @@ initializeApp();
 </script></body></html>
 """
 
+# The page title is TEMPLATE's only placeholder, so substitute it directly
+# instead of running Jinja on every page load. Compressed variants are built
+# once per title, so serving the page costs no compression work. The page is
+# served no-cache: it changes with the board name and on upgrades, so browsers
+# revalidate against the content-hash ETag and get a 304 while it is unchanged.
+@lru_cache(maxsize=8)
+def index_html(board_name: str) -> tuple[dict[str, bytes], str]:
+    body = TEMPLATE.replace("{{ board_name }}", str(escape(board_name))).encode()
+    variants = {"identity": body, "gzip": gzip.compress(body, 9, mtime=0)}
+    if brotli:
+        variants["br"] = brotli.compress(body, quality=11)
+    return variants, hashlib.sha1(body).hexdigest()
+
+@lru_cache(maxsize=1)
+def index_board_name(version: int) -> str | None:
+    """Title for the page; boards only change on mutations, which bump the version"""
+    return db.session.scalar(select(Board.name).order_by(Board.id).limit(1))
+
 # Routes
 # ────────────────────────────────────────────────────────────────────────────────
 @app.route("/")
 def index():
     app.logger.debug("GET / called")
-    b = Board.query.first() 
-    if not b: 
+    name = index_board_name(_board_state["version"])
+    if name is None:
         app.logger.error("Board not found in index route. Check DB setup.")
-        b = Board.query.first() 
-        if not b:
-             return "Error: Kanban board could not be initialized. Check server logs.", 500
-    return render_template_string(TEMPLATE, board_name=b.name)
+        return "Error: Kanban board could not be initialized. Check server logs.", 500
+    variants, etag = index_html(name)
+    encoding = request.accept_encodings.best_match([e for e in variants if e != "identity"])
+    resp = app.response_class(variants[encoding or "identity"], mimetype="text/html",
+                              headers={"Cache-Control": "no-cache",
+                                       "Vary": "Accept-Encoding"})
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+        etag = f"{etag}-{encoding}"  # Each encoding is a distinct representation
+    resp.set_etag(etag)
+    return resp.make_conditional(request)
 
 if __name__ == "__main__":
     app.logger.info(f"Starting Kanban app on port {PORT} with DB_URI: {DB_URI}")
-    app.run(debug=True, port=PORT, use_reloader=False) 
+    try:
+        from waitress import serve
+    except ImportError:
+        serve = None
+    if serve and not DEBUG:
+        serve(app, host="127.0.0.1", port=PORT, threads=THREADS)
+    else:
+        app.run(debug=DEBUG, port=PORT, use_reloader=False, threaded=True) 
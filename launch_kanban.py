@@ -1,7 +1,7 @@
 """launch_kanban.py
 Bootstrap + run script for the Flask Kanban app.
 * Creates (or re-uses) a local virtualenv
-* Installs/updates Flask + Flask-SQLAlchemy inside it
+* Installs/updates Flask + Flask-SQLAlchemy + orjson + waitress inside it
 * Starts kanban_app.py in a child process
 * Polls http://localhost:5000 until it responds, then auto-opens the browser
 Usage:
@@ -24,6 +24,8 @@ from pathlib import Path
 REQUIRED = [
     "flask>=3.0",
     "flask_sqlalchemy>=3.1",
+    "orjson>=3.0",
+    "waitress>=2.0",
 ]
 
 PORT = int(os.getenv("KANBAN_PORT", 5000))